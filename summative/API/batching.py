@@ -0,0 +1,68 @@
+import asyncio
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler for single-row predictions
+
+    Concurrent `/predict` calls are queued for up to `max_wait_ms` (or until
+    `max_batch_size` rows are waiting), stacked into one matrix and scored
+    with a single vectorized `predict_fn` call. Each caller gets back the
+    value for its own row.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batches_flushed = 0
+        self.rows_scored = 0
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._flush_handle = None
+        # Keep references to scoring tasks so they are not garbage collected
+        self._tasks = set()
+
+    async def submit(self, row: np.ndarray) -> float:
+        """Queue one feature row and wait for its prediction"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Hand everything that is waiting to one vectorized call"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._score(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, pending: List[Tuple[np.ndarray, asyncio.Future]]):
+        try:
+            predictions = await self.predict_fn(np.vstack([row for row, _ in pending]))
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_flushed += 1
+        self.rows_scored += len(pending)
+        for (_, future), prediction in zip(pending, predictions):
+            # A caller may have been cancelled (client disconnect) while waiting
+            if not future.done():
+                future.set_result(float(prediction))
@@ -0,0 +1,132 @@
+"""
+Import-time benchmark for the serving module
+
+Runs `python -X importtime -c "import prediction"` in fresh interpreters,
+reports the total import time, the slowest direct imports and the
+worker RSS after import, and compares them against the checked-in
+baseline (import_time_baseline.json):
+
+    python benchmarks/import_time.py            # compare with the baseline
+    python benchmarks/import_time.py --update   # record a new baseline
+
+Exits with status 1 when a training-only module (pandas, matplotlib, ...)
+is pulled in at import time, or when import time / RSS grow past the
+allowed tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_time_baseline.json")
+
+# Must never be imported just to serve predictions
+FORBIDDEN_MODULES = ["pandas", "matplotlib", "seaborn", "sklearn", "joblib", "IPython", "uvicorn"]
+
+PROBE = (
+    "import sys, prediction\n"
+    "try:\n"
+    "    import resource\n"
+    "    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "except ImportError:\n"
+    "    rss_kb = 0\n"
+    "print(rss_kb)\n"
+    "print(','.join(sorted(sys.modules)))\n"
+)
+
+
+def profile_once() -> dict:
+    """Import the serving module in a fresh interpreter and parse -X importtime"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=API_DIR, capture_output=True, text=True, check=True
+    )
+    total_ms = 0.0
+    direct_imports = {}
+    children = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # Each nesting level adds two spaces and children are listed before their parent
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth == 1:
+            children[name.strip()] = int(cumulative_us) / 1000.0
+        elif depth == 0:
+            if name.strip() == "prediction":
+                total_ms = int(cumulative_us) / 1000.0
+                direct_imports = children
+            children = {}
+
+    rss_line, modules_line = completed.stdout.strip().splitlines()[-2:]
+    return {
+        "total_ms": total_ms,
+        "direct_imports_ms": direct_imports,
+        "rss_mb": int(rss_line) / 1024.0,
+        "modules": modules_line.split(",")
+    }
+
+
+def run(repeat: int) -> dict:
+    runs = [profile_once() for _ in range(repeat)]
+    slowest = sorted(runs[-1]["direct_imports_ms"].items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "total_ms": statistics.median(r["total_ms"] for r in runs),
+        "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "slowest_imports_ms": dict(slowest),
+        "forbidden_imported": sorted(
+            name for name in FORBIDDEN_MODULES if name in runs[-1]["modules"]
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to profile (median is reported)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"⏱️  import prediction: {results['total_ms']:.1f} ms, RSS after import: {results['rss_mb']:.1f} MB")
+    for name, ms in results["slowest_imports_ms"].items():
+        print(f"   {name:<30} {ms:9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = []
+    if results["forbidden_imported"]:
+        failures.append(f"training-only modules imported at serve time: {results['forbidden_imported']}")
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        if results["total_ms"] > baseline["total_ms"] * args.tolerance:
+            failures.append(f"import time {results['total_ms']:.1f} ms > {args.tolerance}x baseline {baseline['total_ms']:.1f} ms")
+        if results["rss_mb"] > baseline["rss_mb"] * args.tolerance:
+            failures.append(f"RSS {results['rss_mb']:.1f} MB > {args.tolerance}x baseline {baseline['rss_mb']:.1f} MB")
+    else:
+        print("⚠️  No baseline found, run with --update to record one")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ No import-time regression")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
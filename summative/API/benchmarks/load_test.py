@@ -0,0 +1,182 @@
+"""
+In-process load test of the /predict endpoint
+
+Starts the API in this process (its startup and shutdown hooks run as
+under uvicorn) and drives it through httpx's ASGI transport, so no
+sockets or network stack are involved. For each concurrency level a
+fixed number of requests is sent by that many concurrent clients, and
+throughput plus p50/p95/p99 latency are reported and compared against
+the checked-in baseline (load_test_baseline.json):
+
+    python benchmarks/load_test.py                           # compare with the baseline
+    python benchmarks/load_test.py --update                  # record a new baseline
+    python benchmarks/load_test.py --concurrency 1,64 --distinct 1 --output cached.json
+
+Payloads are random in-bounds inputs; --distinct sets how many different
+ones are cycled through (--distinct 1 measures the prediction cache).
+Serving settings (PREDICT_BATCH_MAX_SIZE, INFERENCE_EXECUTOR, ...) are read
+from the usual environment variables. Exits with status 1 when throughput
+drops or p99 latency grows past the allowed tolerance.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_test_baseline.json")
+
+# Recorded with the results, since they change what is being measured
+SETTINGS = ["PREDICT_BATCH_MAX_SIZE", "PREDICT_BATCH_MAX_WAIT_MS", "INFERENCE_EXECUTOR", "INFERENCE_WORKERS",
+            "INFERENCE_MAX_QUEUE", "PREDICTION_CACHE_SIZE", "COMPILE_TREE_MODELS", "FUSE_LINEAR_MODELS"]
+
+
+def make_payloads(count: int, seed: int = 0) -> list:
+    """JSON bodies for /predict drawn uniformly within the API's Field bounds"""
+    from model_latency import random_inputs
+    from prediction import feature_names
+    return [dict(zip(feature_names, row.tolist())) for row in random_inputs(count, seed)]
+
+
+async def drive(client, path: str, payloads: list, requests: int, concurrency: int) -> dict:
+    """Send `requests` POSTs from `concurrency` concurrent clients; returns throughput and latency percentiles"""
+    latencies = []
+    errors = 0
+    next_request = 0
+
+    async def client_loop():
+        nonlocal errors, next_request
+        # Single event loop: taking the next index needs no lock
+        while next_request < requests:
+            payload = payloads[next_request % len(payloads)]
+            next_request += 1
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000.0
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99)
+    }
+
+
+async def run(levels: list, requests: int, warmup: int, distinct: int, model: str) -> dict:
+    import httpx
+    import prediction
+
+    path = f"/predict?model={model}" if model else "/predict"
+    payloads = make_payloads(distinct)
+    results = []
+    # The API's own startup log would interleave with the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        lifespan = prediction.app.router.lifespan_context(prediction.app)
+        await lifespan.__aenter__()
+    try:
+        transport = httpx.ASGITransport(app=prediction.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            served = prediction.resolve_model(model)
+            await drive(client, path, make_payloads(warmup, seed=1), warmup, max(levels))
+            for concurrency in levels:
+                if served.cache is not None:
+                    # Every level starts cold, whatever the previous one cached
+                    served.cache.clear()
+                results.append(await drive(client, path, payloads, requests, concurrency))
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await lifespan.__aexit__(None, None, None)
+    return {
+        "python": sys.version.split()[0],
+        "model": served.name,
+        "engine": type(served.model).__name__,
+        "distinct_payloads": distinct,
+        "settings": {name: os.environ[name] for name in SETTINGS if name in os.environ},
+        "levels": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=2000, help="requests sent at each concurrency level")
+    parser.add_argument("--warmup", type=int, default=200, help="requests sent before measuring")
+    parser.add_argument("--distinct", type=int, default=None,
+                        help="different payloads cycled through (default: one per request)")
+    parser.add_argument("--model", help="model to target with ?model= (default: the API's default model)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    os.chdir(API_DIR)
+    sys.path.insert(0, API_DIR)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = asyncio.run(run(levels, args.requests, args.warmup, args.distinct or args.requests, args.model))
+
+    print(f"⏱️  /predict load test ({results['model']}, {results['engine']}, "
+          f"{results['distinct_payloads']} distinct payloads)")
+    print(f"   {'clients':>7} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for level in results["levels"]:
+        print(f"   {level['concurrency']:>7} {level['requests']:>8} {level['errors']:>6} "
+              f"{level['throughput_rps']:9.1f} {level['p50_ms']:8.2f} {level['p95_ms']:8.2f} {level['p99_ms']:8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = [f"{level['errors']} failed requests at concurrency {level['concurrency']}"
+                for level in results["levels"] if level["errors"]]
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        comparable = all(baseline.get(key) == results[key] for key in ("model", "distinct_payloads", "settings"))
+        if not comparable:
+            print("⚠️  Baseline was recorded with a different model, payload mix or settings, not comparing")
+        else:
+            expected_levels = {level["concurrency"]: level for level in baseline["levels"]}
+            for level in results["levels"]:
+                expected = expected_levels.get(level["concurrency"])
+                if expected is None:
+                    continue
+                if level["throughput_rps"] * args.tolerance < expected["throughput_rps"]:
+                    failures.append(f"concurrency {level['concurrency']}: {level['throughput_rps']:.1f} req/s < "
+                                    f"baseline {expected['throughput_rps']:.1f} req/s / {args.tolerance}")
+                if level["p99_ms"] > expected["p99_ms"] * args.tolerance:
+                    failures.append(f"concurrency {level['concurrency']}: p99 {level['p99_ms']:.2f} ms > "
+                                    f"{args.tolerance}x baseline {expected['p99_ms']:.2f} ms")
+    else:
+        print("⚠️  No baseline found, run with --update to record one")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ No load test regression")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
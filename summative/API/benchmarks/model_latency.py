@@ -0,0 +1,176 @@
+"""
+Micro-benchmark of model scoring for the shipped .pkl models
+
+Loads best_model_random_forest.pkl, best_model_linear_regression.pkl and
+best_model_decision_tree.pkl the way the API serves them (or as plain
+sklearn with --sklearn), plus the rule-based fallback model, and times
+scoring random in-bounds inputs at
+batch sizes 1 to 10,000. Batch size 1 goes through make_model_prediction,
+larger batches through make_batch_model_prediction, the vectorized call
+it wraps. Results are compared against the checked-in baseline
+(model_latency_baseline.json):
+
+    python benchmarks/model_latency.py                  # compare with the baseline
+    python benchmarks/model_latency.py --update         # record a new baseline
+    python benchmarks/model_latency.py --sklearn --output sklearn.json
+
+Exits with status 1 when the median time per call of any model and batch
+size grows past the allowed tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_latency_baseline.json")
+
+MODELS = [
+    ("random_forest", "Random Forest", "best_model_random_forest.pkl"),
+    ("linear_regression", "Linear Regression", "best_model_linear_regression.pkl"),
+    ("decision_tree", "Decision Tree", "best_model_decision_tree.pkl")
+]
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def random_inputs(n_rows: int, seed: int = 0) -> np.ndarray:
+    """(n_rows, n_features) matrix drawn uniformly within the API's Field bounds"""
+    from prediction import feature_bounds
+    rng = np.random.default_rng(seed)
+    bounds = list(feature_bounds().values())
+    low = np.array([low for low, _ in bounds])
+    high = np.array([high for _, high in bounds])
+    return rng.uniform(low, high, size=(n_rows, len(bounds)))
+
+
+def time_calls(func, min_time: float, min_repeat: int) -> list:
+    """Call func until both min_repeat calls and min_time seconds are reached; returns per-call seconds"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < min_repeat or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - call_started)
+    return times
+
+
+def load_models(sklearn: bool) -> list:
+    """ServedModels for the shipped pickles and the heuristic, without the API's cache or micro-batcher"""
+    import prediction
+    from model_registry import ModelRegistry
+
+    registry = ModelRegistry(
+        prediction.feature_names, prediction.SCALER_FILES,
+        compile_trees=not sklearn, fuse_linear=not sklearn, mmap_mode=prediction.MMAP_MODE
+    )
+    served_models = []
+    for name, display_name, model_file in MODELS:
+        if not os.path.exists(model_file):
+            print(f"⚠️  {model_file} not found, skipping {display_name}")
+            continue
+        registry.register(name, display_name, [model_file])
+        served_models.append(registry.load(name))
+    served_models.append(
+        registry.publish_builtin("heuristic", "Intelligent Heuristic Model", prediction.heuristic_model)
+    )
+    return served_models
+
+
+def run(batch_sizes: list, min_time: float, min_repeat: int, sklearn: bool) -> dict:
+    import prediction
+
+    results = {}
+    for served in load_models(sklearn):
+        # Pay one-off costs (lazy imports, page faults) outside the timings
+        served.predict_sync(random_inputs(1))
+        results[served.name] = {"engine": type(served.model).__name__, "batches": {}}
+        for batch_size in batch_sizes:
+            matrix = random_inputs(batch_size, seed=batch_size)
+            if batch_size == 1:
+                row = matrix[0]
+                times = time_calls(lambda: prediction.make_model_prediction(row, served), min_time, min_repeat)
+            else:
+                times = time_calls(lambda: prediction.make_batch_model_prediction(matrix, served),
+                                   min_time, min_repeat)
+            median = statistics.median(times)
+            results[served.name]["batches"][str(batch_size)] = {
+                "calls": len(times),
+                "median_ms": median * 1000.0,
+                "p95_ms": float(np.percentile(times, 95)) * 1000.0,
+                "rows_per_second": batch_size / median
+            }
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "engine": "sklearn" if sklearn else "serving",
+        "models": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default=",".join(str(size) for size in BATCH_SIZES),
+                        help="comma separated batch sizes")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to spend on each model and batch size")
+    parser.add_argument("--min-repeat", type=int, default=5, help="minimum calls per model and batch size")
+    parser.add_argument("--sklearn", action="store_true",
+                        help="score with the unmodified sklearn models (no flat forest, no fused scaler)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    os.chdir(API_DIR)
+    sys.path.insert(0, API_DIR)
+    # sklearn warns on every call scored without feature names, which would flood the report
+    warnings.simplefilter("ignore", UserWarning)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    results = run(batch_sizes, args.min_time, args.min_repeat, args.sklearn)
+
+    print(f"⏱️  Model scoring latency ({results['engine']} engines)")
+    print(f"   {'model':<20} {'engine':<18} {'batch':>6} {'median ms':>10} {'p95 ms':>10} {'rows/s':>12}")
+    for name, model in results["models"].items():
+        for batch_size, timing in model["batches"].items():
+            print(f"   {name:<20} {model['engine']:<18} {batch_size:>6} {timing['median_ms']:10.3f} "
+                  f"{timing['p95_ms']:10.3f} {timing['rows_per_second']:12,.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline written to {BASELINE_FILE}")
+        return 0
+
+    failures = []
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        if baseline["engine"] != results["engine"]:
+            print(f"⚠️  Baseline was recorded with {baseline['engine']} engines, not comparing")
+        else:
+            for name, model in results["models"].items():
+                for batch_size, timing in model["batches"].items():
+                    expected = baseline["models"].get(name, {}).get("batches", {}).get(batch_size)
+                    if expected and timing["median_ms"] > expected["median_ms"] * args.tolerance:
+                        failures.append(f"{name} batch {batch_size}: {timing['median_ms']:.3f} ms > "
+                                        f"{args.tolerance}x baseline {expected['median_ms']:.3f} ms")
+    else:
+        print("⚠️  No baseline found, run with --update to record one")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ No model latency regression")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+
+
+class StreamFormatError(ValueError):
+    """Raised when an uploaded stream cannot be parsed any further"""
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that are still reading the request body
+
+    Starlette's StreamingResponse listens on `receive` for a disconnect while
+    it sends, which would steal request body chunks from the upload reader.
+    Here the body reader is the only consumer of `receive`.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+class MultipartFileStream:
+    """
+    Incrementally extract the uploaded file from a multipart/form-data body
+
+    Chunks go through python-multipart's streaming parser and only the
+    data of the first part with a filename (or the first part, if none has
+    one) is returned, so the upload never has to be spooled to disk.
+    """
+
+    def __init__(self, content_type: str):
+        # Only needed for multipart uploads, so kept out of the API import path
+        try:
+            from python_multipart.multipart import MultipartParser, parse_options_header
+        except ImportError:  # python-multipart < 0.0.13
+            from multipart.multipart import MultipartParser, parse_options_header
+
+        self._parse_options_header = parse_options_header
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise StreamFormatError("Missing boundary in multipart/form-data content type")
+
+        self.filename: Optional[str] = None
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._selected = False
+        self._finished = False
+        self._reading = False
+        self._data: List[bytes] = []
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field, self._value = b"", b""
+
+    def _on_headers_finished(self):
+        if self._finished:
+            return
+        _, params = self._parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = params.get(b"filename")
+        # Prefer the file field, but accept a plain form field if it comes first
+        if filename is not None or not self._selected:
+            if self._selected:
+                self._data.clear()
+            self._selected = filename is not None
+            self._reading = True
+            self.filename = filename.decode("utf-8", "replace") if filename else None
+
+    def _on_part_data(self, data, start, end):
+        if self._reading:
+            self._data.append(data[start:end])
+
+    def _on_part_end(self):
+        if self._reading:
+            self._reading = False
+            self._finished = self._selected
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Parse one body chunk and return the file bytes it contained"""
+        self._parser.write(chunk)
+        data = b"".join(self._data)
+        self._data.clear()
+        return data
+
+
+async def iter_upload(chunks: AsyncIterator[bytes], content_type: str) -> AsyncIterator[bytes]:
+    """File bytes of a raw (CSV/NDJSON) or multipart/form-data request body"""
+    if content_type.lower().startswith("multipart/form-data"):
+        upload = MultipartFileStream(content_type)
+        async for chunk in chunks:
+            data = upload.feed(chunk)
+            if data:
+                yield data
+    else:
+        async for chunk in chunks:
+            if chunk:
+                yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = 1 << 20) -> AsyncIterator[str]:
+    """Decode UTF-8 chunks into lines without holding more than one partial line"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        if len(pending) > max_line_bytes:
+            raise StreamFormatError(f"Line longer than {max_line_bytes} bytes")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterator[str],
+                       fmt: Optional[str] = None) -> AsyncIterator[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Yield (record, error) for every data line of a CSV or NDJSON stream
+
+    The format is sniffed from the first non-empty line when not given: a
+    line starting with '{' means NDJSON, anything else is a CSV header.
+    CSV column names are matched case-insensitively, so the training panel
+    (`GDP_per_capita`, `Literacy_rate`, ...) can be uploaded as is.
+    """
+    header: Optional[List[str]] = None
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt is None:
+            fmt = "ndjson" if line.lstrip().startswith("{") else "csv"
+
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as je:
+                yield None, f"Invalid JSON: {je.msg}"
+                continue
+            if isinstance(record, dict):
+                yield record, None
+            else:
+                yield None, "Each NDJSON line must be a JSON object"
+        elif fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [column.strip().lower() for column in values]
+                continue
+            if len(values) != len(header):
+                yield None, f"Expected {len(header)} CSV fields, got {len(values)}"
+            else:
+                yield dict(zip(header, values)), None
+        else:
+            raise StreamFormatError(f"Unknown format '{fmt}' (expected 'csv' or 'ndjson')")
+
+
+async def iter_chunks(records: AsyncIterator[tuple], chunk_size: int) -> AsyncIterator[List[tuple]]:
+    """Group (record, error) pairs into lists of at most `chunk_size`"""
+    chunk = []
+    async for item in records:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
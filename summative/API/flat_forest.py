@@ -0,0 +1,218 @@
+import os
+
+import numpy as np
+
+# Arrays of a compiled forest (see flat_forest_arrays)
+FLAT_FOREST_KEYS = ('feature', 'threshold', 'children_left', 'children_right', 'children',
+                    'value', 'roots', 'max_depth', 'n_features', 'feature_importances')
+
+
+def _as_array(values, dtype):
+    """
+    Use stored arrays as-is (keeps memory maps shared) unless a conversion is needed
+
+    Any int32/int64 array is accepted where `dtype` is an integer type, and
+    any float32/float64 array where it is a float type, so float32 bundles
+    are served from their mapped pages instead of a float64 copy.
+    """
+    if isinstance(values, np.ndarray) and values.flags.c_contiguous:
+        accepted = {'i': (np.int32, np.int64), 'f': (np.float32, np.float64)}.get(np.dtype(dtype).kind, (dtype,))
+        if values.dtype in accepted:
+            return values
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def flat_forest_arrays(model) -> dict:
+    """
+    Flat node arrays of a fitted RandomForestRegressor or DecisionTreeRegressor
+
+    All trees are concatenated into contiguous node arrays (feature,
+    threshold, left child, right child, value). Leaves point back to
+    themselves so every tree can be walked for a whole batch with
+    vectorized indexing. Used by FlatForest.from_sklearn and, to write
+    model bundles, by save_best_model.
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        # Leaves loop back to themselves and read feature 0 (the result is ignored)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+
+    children_left = np.concatenate(lefts).astype(np.int32)
+    children_right = np.concatenate(rights).astype(np.int32)
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'children_left': children_left,
+        'children_right': children_right,
+        # Interleaved (left, right) pairs, walked with a single gather per step
+        'children': np.stack([children_left, children_right], axis=1).ravel(),
+        'value': np.concatenate(values).astype(np.float64),
+        'roots': np.array(roots, dtype=np.int32),
+        'max_depth': np.array(max(estimator.tree_.max_depth for estimator in estimators)),
+        'n_features': np.array(model.n_features_in_),
+        'feature_importances': np.asarray(model.feature_importances_, dtype=np.float64)
+    }
+
+
+class FlatForest:
+    """
+    Array-based inference engine for sklearn tree regressors
+
+    All trees of a RandomForestRegressor (or a single DecisionTreeRegressor)
+    are concatenated into contiguous node arrays. Leaves point to themselves,
+    so a batch is scored by stepping every (tree, row) pair `max_depth`
+    times with vectorized NumPy indexing, without sklearn's per-call
+    validation and joblib dispatch.
+
+    With float64 node arrays predictions match sklearn exactly: inputs are
+    compared in float32 like sklearn's tree code, and tree outputs are
+    summed in estimator order before dividing by the number of trees.
+    Float32 thresholds and values (float32 bundles) are used as stored.
+    Their thresholds are rounded so every input takes the same path, but
+    the leaf values are rounded too, so predictions are only within float32
+    precision of sklearn's (relative error up to about 6e-8, a few 1e-6 on
+    employment rates).
+
+    The NumPy walk touches every (tree, row, depth) step, so it wins for
+    request-sized batches but loses to sklearn's compiled loop on very large
+    ones. When a `fallback_model` is attached, batches above `max_rows` are
+    handed to it instead.
+    """
+
+    max_rows = 1024
+    fallback_model = None
+
+    def __init__(self, feature, threshold, children_left=None, children_right=None,
+                 value=None, roots=None, max_depth=0, n_features=0, feature_importances=None,
+                 children=None):
+        self.feature = _as_array(feature, np.intp)
+        self.threshold = _as_array(threshold, np.float64)
+        # Interleaved (left, right) pairs so each step needs a single gather
+        if children is None:
+            children = np.stack([_as_array(children_left, np.intp),
+                                 _as_array(children_right, np.intp)], axis=1).ravel()
+        self._children = _as_array(children, np.intp)
+        # Model bundles only store the pairs; each side is then a strided view of them
+        self.children_left = self._children[0::2] if children_left is None else _as_array(children_left, np.intp)
+        self.children_right = self._children[1::2] if children_right is None else _as_array(children_right, np.intp)
+        self.value = _as_array(value, np.float64)
+        self.roots = _as_array(roots, np.intp)
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        if feature_importances is not None:
+            self.feature_importances_ = np.asarray(feature_importances, dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        """Flatten a fitted RandomForestRegressor or DecisionTreeRegressor"""
+        return cls(**flat_forest_arrays(model))
+
+    @classmethod
+    def load(cls, path: str, mmap_mode=None) -> "FlatForest":
+        """
+        Load a forest saved as one .npy file per flat_forest_arrays entry
+
+        `path` is a directory of .npy files; with mmap_mode='r' the node
+        arrays are memory-mapped, so every worker process on the machine
+        shares one copy through the OS page cache. Older single-file .npz
+        exports are still accepted (always read into memory).
+        """
+        if os.path.isdir(path):
+            arrays = {
+                key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mmap_mode)
+                for key in FLAT_FOREST_KEYS
+                if os.path.exists(os.path.join(path, f"{key}.npy"))
+            }
+        else:
+            with np.load(path) as data:
+                arrays = {key: data[key] for key in FLAT_FOREST_KEYS if key in data}
+        return cls(**arrays)
+
+    def predict(self, X) -> np.ndarray:
+        """Predict for an (n_rows, n_features) matrix"""
+        if self.fallback_model is not None and len(X) > self.max_rows:
+            return self.fallback_model.predict(X)
+
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input with shape (n_rows, {self.n_features_in_}), got {X.shape}")
+
+        n_rows = X.shape[0]
+        X_flat = X.ravel()
+        row_offsets = np.arange(n_rows)[None, :] * self.n_features_in_
+        # One column per row, one line per tree: every pair walks down together
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            go_right = X_flat.take(row_offsets + self.feature.take(nodes)) > self.threshold.take(nodes)
+            nodes = self._children.take(2 * nodes + go_right)
+
+        leaf_values = self.value.take(nodes)
+        # Accumulate tree by tree (same order as sklearn) so float64 results match bit for bit
+        prediction = np.zeros(X.shape[0], dtype=np.float64)
+        for tree_values in leaf_values:
+            prediction += tree_values
+        return prediction / len(self.roots)
+
+    def contributions(self, X) -> tuple:
+        """
+        Per-row feature attributions along each tree's decision path
+
+        Every split adds value[child] - value[node] to the feature it splits
+        on (Saabas method). Returns an (n_rows, n_features) matrix and the
+        baseline (mean root value); each row sums back to its prediction.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input with shape (n_rows, {self.n_features_in_}), got {X.shape}")
+
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = np.arange(n_rows)[None, :] * n_features
+        totals = np.zeros(n_rows * n_features, dtype=np.float64)
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            cells = row_offsets + self.feature.take(nodes)
+            go_right = X_flat.take(cells) > self.threshold.take(nodes)
+            children = self._children.take(2 * nodes + go_right)
+            # Leaves point to themselves, so finished paths add zero
+            delta = np.subtract(self.value.take(children), self.value.take(nodes), dtype=np.float64)
+            totals += np.bincount(cells.ravel(), weights=delta.ravel(), minlength=totals.size)
+            nodes = children
+
+        n_trees = len(self.roots)
+        baseline = self.value.take(self.roots).sum(dtype=np.float64) / n_trees
+        return totals.reshape(n_rows, n_features) / n_trees, np.full(n_rows, baseline)
+
+
+def compile_tree_model(model, n_probe: int = 512, seed: int = 0, keep_fallback: bool = True):
+    """
+    Compile a fitted sklearn tree regressor into a FlatForest
+
+    Returns None when the model is not tree based, or when the compiled
+    engine does not reproduce sklearn's predictions on random probe inputs.
+    With `keep_fallback` the sklearn model is kept for very large batches.
+    """
+    if not (hasattr(model, 'estimators_') or hasattr(model, 'tree_')):
+        return None
+    if hasattr(model, 'estimators_') and not all(hasattr(e, 'tree_') for e in model.estimators_):
+        return None
+
+    compiled = FlatForest.from_sklearn(model)
+    # Models are trained on standardized features, so probe around zero
+    probe = np.random.default_rng(seed).normal(0.0, 2.0, size=(n_probe, compiled.n_features_in_))
+    if not np.array_equal(compiled.predict(probe), model.predict(probe)):
+        return None
+    if keep_fallback:
+        compiled.fallback_model = model
+    return compiled
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class FusedLinearModel:
+    """
+    Linear model with the StandardScaler folded into its weights
+
+    With scaled = (x - mean) / scale and y = scaled @ coef + intercept,
+    the prediction is x @ (coef / scale) + (intercept - (mean / scale) @ coef).
+    Both terms are computed once at load time, so serving is a single
+    `X @ w + b` on the raw features with no intermediate scaled copy.
+
+    `coef_` keeps the original (scaled space) coefficients so feature
+    importance reporting is unchanged.
+    """
+
+    # Callers must pass raw features: the scaler is already applied
+    includes_scaling = True
+    # A dot product is faster than interpolating a response surface
+    cheap_to_evaluate = True
+
+    def __init__(self, weights, bias, coef=None, mean=None):
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.coef_ = np.asarray(coef if coef is not None else weights, dtype=np.float64)
+        self.mean_ = np.zeros_like(self.weights) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.n_features_in_ = self.weights.shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        """Predict for an (n_rows, n_features) matrix of raw features"""
+        return np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+
+    def contributions(self, X) -> tuple:
+        """
+        Per-row linear term contributions coef_j * scaled_x_j
+
+        Returns an (n_rows, n_features) matrix and the baseline (the
+        intercept, i.e. the prediction for an average input).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        baseline = self.bias + float(self.mean_ @ self.weights)
+        return (X - self.mean_) * self.weights, np.full(X.shape[0], baseline)
+
+
+def fuse_linear_model(model, scaler):
+    """
+    Fold a fitted StandardScaler into a linear model
+
+    Supports sklearn linear models (coef_/intercept_) and the custom
+    GradientDescentLinearRegression (weights/bias). Returns None for any
+    other model, or when the model is not single-output.
+    """
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        coef, intercept = model.coef_, model.intercept_
+    elif getattr(model, 'weights', None) is not None and getattr(model, 'bias', None) is not None:
+        coef, intercept = model.weights, model.bias
+    else:
+        return None
+
+    coef = np.asarray(coef, dtype=np.float64)
+    if coef.ndim != 1 or np.ndim(intercept) != 0:
+        return None
+
+    mean = getattr(scaler, 'mean_', None) if scaler is not None else None
+    scale = getattr(scaler, 'scale_', None) if scaler is not None else None
+    mean = np.zeros_like(coef) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones_like(coef) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    weights = coef / scale
+    bias = float(intercept) - float(mean @ weights)
+    return FusedLinearModel(weights, bias, coef=coef, mean=mean)
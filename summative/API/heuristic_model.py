@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+import numpy as np
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix64(z: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: scrambles every bit of z into every bit of the result"""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def row_uniform(X: np.ndarray, seed: int) -> np.ndarray:
+    """One uniform [0, 1) draw per row, a pure function of the row's values and the seed"""
+    bits = np.ascontiguousarray(X, dtype=np.float64).view(np.uint64)
+    with np.errstate(over="ignore"):
+        state = np.full(bits.shape[0], np.uint64(seed) ^ _GOLDEN_GAMMA, dtype=np.uint64)
+        for column in bits.T:
+            state = _mix64(state ^ column)
+    return (state >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+class HeuristicModel:
+    """
+    Rule-based employment rate estimate, used when no trained model loads
+
+    Weighted education (40%), economic development (35%) and demographic
+    (25%) scores, plus a noise term, clamped to 35-85%. It scores a whole
+    (n_rows, n_features) matrix at once, so it can be served through the
+    same batching, caching and inference pool paths as a trained model.
+
+    The noise is uniform in [-noise, noise] and derived from a hash of the
+    row and `seed`, so the same input always gets the same prediction
+    (which keeps results reproducible and cacheable). noise=0 disables it.
+    """
+
+    # Group weights reported as the model's feature importance
+    importance_groups = {"education_systems": 40.0, "economic_development": 35.0, "demographics": 25.0}
+    # The heuristic's own confidence levels (see ServedModel.confidence_level)
+    confidence_thresholds = ((70.0, "High"), (55.0, "Medium"))
+    # A few vectorized arithmetic steps: not worth a response surface
+    cheap_to_evaluate = True
+
+    def __init__(self, feature_names: List[str], noise: float = 2.0, seed: Optional[int] = 0):
+        self.feature_names = list(feature_names)
+        self.noise = float(noise)
+        self.seed = int(seed or 0)
+        self.n_features_in_ = len(self.feature_names)
+        self._columns = {feature: index for index, feature in enumerate(self.feature_names)}
+
+    def scores(self, X) -> tuple:
+        """Per-row (education, economic, demographic) scores"""
+        X = np.asarray(X, dtype=np.float64)
+        column = lambda feature: X[:, self._columns[feature]]
+        education = (column("school_enrollment_primary") * 0.3 +
+                     column("school_enrollment_secondary") * 0.5 +
+                     column("literacy_rate") * 0.2)
+        economic = np.minimum(np.log(column("gdp_per_capita") + 1) * 8, 100)
+        life_expectancy_factor = np.minimum(column("life_expectancy") / 70.0, 1.2)
+        population_factor = np.where(column("population") < 50000000, 1.0, 0.95)
+        demographic = column("urban_population_percent") * life_expectancy_factor * population_factor
+        return education, economic, demographic
+
+    def predict(self, X) -> np.ndarray:
+        """Predicted employment rate for each row of X"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        education, economic, demographic = self.scores(X)
+        prediction = education * 0.40 + economic * 0.35 + demographic * 0.25
+        if self.noise:
+            prediction = prediction + (row_uniform(X, self.seed) * 2.0 - 1.0) * self.noise
+        return np.clip(prediction, 35, 85)
@@ -0,0 +1,236 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional
+
+import numpy as np
+
+from flat_forest import FlatForest, compile_tree_model
+from fused_linear import fuse_linear_model
+from metrics import MODEL_BATCH_ROWS, observe_stage
+from model_bundle import is_bundle, load_bundle
+
+
+class QueueFullError(Exception):
+    """Raised when the inference pool already has `max_queue` jobs in flight"""
+
+
+def load_model_artifact(path: str, mmap_mode: Optional[str] = None):
+    """
+    Load a model file: flat forest arrays (directory or .npz) or a joblib pickle
+
+    With mmap_mode='r', NumPy buffers are memory-mapped instead of copied,
+    so worker processes share their pages through the OS page cache.
+    """
+    if os.path.isdir(path) or path.endswith(".npz"):
+        return FlatForest.load(path, mmap_mode=mmap_mode)
+    # joblib (and sklearn, through unpickling) are only imported when a pickle is loaded
+    import joblib
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def load_serving_model(model_file: str, scaler_file: Optional[str] = None,
+                       compile_trees: bool = True, fuse_linear: bool = True,
+                       mmap_mode: Optional[str] = None, report=None,
+                       feature_names: Optional[list] = None) -> tuple:
+    """
+    Load a model and its scaler, then apply the serving optimizations
+
+    Model bundles (see model_bundle.py) are loaded with their own scaler
+    and `scaler_file` is ignored. Pickled tree models are compiled into a
+    FlatForest, and the scaler is folded into linear models. `report` (a StartupReport) records each stage.
+    A bundle trained on other features than `feature_names` (in order) is rejected.
+    Returns (model, scaler).
+    """
+    def timed(stage, artifact):
+        return report.timed(stage, artifact) if report is not None else nullcontext()
+
+    if is_bundle(model_file):
+        # Bundles carry the scaler the model was trained with
+        with timed("load", model_file):
+            model, scaler, _ = load_bundle(model_file, mmap_mode, feature_names=feature_names)
+        if fuse_linear:
+            model = fuse_linear_model(model, scaler) or model
+        return model, scaler
+
+    with timed("load", model_file):
+        model = load_model_artifact(model_file, mmap_mode)
+    if compile_trees and not isinstance(model, FlatForest):
+        with timed("compile", model_file):
+            model = compile_tree_model(model) or model
+
+    scaler = None
+    if scaler_file:
+        with timed("load", scaler_file):
+            scaler = load_model_artifact(scaler_file, mmap_mode)
+    if fuse_linear:
+        model = fuse_linear_model(model, scaler) or model
+    return model, scaler
+
+
+def predict_matrix(model, scaler, input_matrix: np.ndarray, record=observe_stage) -> np.ndarray:
+    """
+    Score an (n_rows, n_features) matrix with a single scaler/model call
+
+    `record(stage, seconds)` receives the scaling and inference times.
+    """
+    started = time.perf_counter()
+    # Fused linear models already include the scaler
+    if scaler is not None and not getattr(model, 'includes_scaling', False):
+        input_matrix = scaler.transform(input_matrix)
+        scaled = time.perf_counter()
+        record("scaling", scaled - started)
+        started = scaled
+    predictions = np.asarray(model.predict(input_matrix), dtype=float)
+    record("inference", time.perf_counter() - started)
+    return predictions
+
+
+# Per-process models for the process pool, keyed by ServedModel.worker_spec
+_worker_models: "OrderedDict[tuple, tuple]" = OrderedDict()
+_WORKER_MAX_MODELS = 4
+
+
+def _worker_load(spec: tuple) -> tuple:
+    """Load a model version once per pool process (keeps the most recent few)"""
+    if spec not in _worker_models:
+        model_file, scaler_file, compile_trees, fuse_linear, mmap_mode, _ = spec
+        _worker_models[spec] = load_serving_model(
+            model_file, scaler_file, compile_trees, fuse_linear, mmap_mode
+        )
+        while len(_worker_models) > _WORKER_MAX_MODELS:
+            _worker_models.popitem(last=False)
+    _worker_models.move_to_end(spec)
+    return _worker_models[spec]
+
+
+def _worker_predict(spec: tuple, input_matrix: np.ndarray) -> tuple:
+    """Score a matrix inside a pool process; returns (predictions, stage timings)"""
+    model, scaler = _worker_load(spec)
+    # Metrics recorded in a worker process would never be scraped, so the
+    # timings travel back with the predictions
+    timings = []
+    predictions = predict_matrix(model, scaler, input_matrix,
+                                 record=lambda stage, seconds: timings.append((stage, seconds)))
+    return predictions, timings
+
+
+def _worker_predict_model(model, scaler, input_matrix: np.ndarray) -> tuple:
+    """Score a matrix inside a pool process with a model sent along with it (models without files)"""
+    timings = []
+    predictions = predict_matrix(model, scaler, input_matrix,
+                                 record=lambda stage, seconds: timings.append((stage, seconds)))
+    return predictions, timings
+
+
+def _worker_preload(spec: tuple) -> bool:
+    _worker_load(spec)
+    return True
+
+
+def _worker_init(specs: tuple):
+    """Pool process initializer: load every served model version before taking any job"""
+    for spec in specs:
+        try:
+            _worker_load(spec)
+        except Exception:
+            # Jobs for this version load it again and report the error themselves
+            pass
+
+
+class InferencePool:
+    """
+    Runs CPU-bound model inference off the event loop
+
+    kind="thread" shares the already loaded models between threads (sklearn
+    and NumPy release the GIL in their inner loops). kind="process" gives
+    each worker process its own copy of every model version it serves,
+    loaded by the process initializer before it takes any job. At most `max_queue` jobs may be in flight;
+    further calls raise QueueFullError so the API can answer 503 instead
+    of queueing forever.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None,
+                 max_queue: int = 256):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind '{kind}' (expected 'thread' or 'process')")
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max(1, int(max_queue))
+        self.in_flight = 0
+        self.rejected = 0
+        # Latest version of each model, preloaded by every new pool process
+        self._preload_specs = {}
+        # Jobs are submitted and executors swapped under this lock (reloads run in a thread)
+        self._executor_lock = threading.Lock()
+
+        if kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+        else:
+            self._executor = self._new_process_executor()
+
+    def _new_process_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_worker_init,
+                                   initargs=(tuple(self._preload_specs.values()),))
+
+    def warm_up(self, served):
+        """
+        Load a model version in every pool process before it takes traffic
+
+        Processes are started with the versions to preload, so the pool is
+        replaced by one whose initializer loads this version too. Jobs
+        already running finish in the old pool.
+        """
+        # Models without files (built in memory) are sent with every job instead
+        if self.kind == "process" and served.model_file is not None:
+            self._preload_specs[served.name] = served.worker_spec
+            executor = self._new_process_executor()
+            # Start the processes now rather than on the first request
+            jobs = [executor.submit(_worker_preload, served.worker_spec)
+                    for _ in range(self.max_workers)]
+            for job in jobs:
+                job.result()
+            with self._executor_lock:
+                previous, self._executor = self._executor, executor
+            previous.shutdown(wait=False)
+
+    async def run(self, input_matrix: np.ndarray, served) -> np.ndarray:
+        """Score a matrix with a ServedModel in the pool, or raise QueueFullError when saturated"""
+        # Only touched from the event loop thread, so no lock is needed
+        if self.in_flight >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(f"Inference queue is full ({self.max_queue} jobs in flight)")
+
+        self.in_flight += 1
+        MODEL_BATCH_ROWS.observe(len(input_matrix))
+        try:
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                return await loop.run_in_executor(self._executor, served.predict_sync, input_matrix)
+            # run_in_executor submits right away, so the job never lands in a pool being shut down
+            with self._executor_lock:
+                if served.model_file is None:
+                    job = loop.run_in_executor(
+                        self._executor, _worker_predict_model, served.model, served.scaler, input_matrix
+                    )
+                else:
+                    job = loop.run_in_executor(
+                        self._executor, _worker_predict, served.worker_spec, input_matrix
+                    )
+            predictions, timings = await job
+            for stage, seconds in timings:
+                observe_stage(stage, seconds)
+            return predictions
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        with self._executor_lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,254 @@
+"""
+Low-overhead counters and histograms exposed in Prometheus text format
+
+Every thread records into its own shard (a dict reached through a
+threading.local), so observing a value on the hot path takes no lock and
+never contends with other threads. Shards are only summed when `/metrics`
+is scraped. Values that already live elsewhere (cache and batcher
+counters, model load times) are read at scrape time through collectors
+instead of being copied on every request.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds: 25 us to 5 s
+LATENCY_BUCKETS = (0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Rows per model call
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 10000)
+
+# A collector returns (labels, value) samples for one metric at scrape time
+Collector = Callable[[], Iterable[Tuple[dict, float]]]
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Sharded:
+    """Per-thread storage; a shard is created (under a lock) once per thread"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            return [dict(shard) for shard in self._shards]
+
+
+class Counter(_Sharded):
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, amount: float = 1.0, *labelvalues):
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        totals: Dict[tuple, float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(totals.items())]
+
+
+class Histogram(_Sharded):
+    """Fixed-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues):
+        shard = self._shard()
+        cell = shard.get(labelvalues)
+        if cell is None:
+            # One count per bucket, one for +Inf, then the running sum
+            cell = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def render(self) -> List[str]:
+        totals: Dict[tuple, list] = {}
+        for shard in self._snapshot():
+            for key, cell in shard.items():
+                total = totals.setdefault(key, [0] * len(cell))
+                for i, value in enumerate(cell):
+                    total[i] += value
+        lines = []
+        for key, cell in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), cell[:-1]):
+                cumulative += count
+                le = 'le="{}"'.format(bound if bound == "+Inf" else _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(cell[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class CollectedMetric:
+    """Gauge or counter whose samples are read from a collector at scrape time"""
+
+    def __init__(self, name: str, documentation: str, kind: str, collector: Collector):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.collector = collector
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, value in self.collector():
+            lines.append(f"{self.name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the metrics and renders them in Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+        self.started_at = time.time()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collect(self, name: str, documentation: str, kind: str, collector: Collector) -> CollectedMetric:
+        metric = CollectedMetric(name, documentation, kind, collector)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Shared by the API and the inference pool
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "employment_stage_seconds",
+    "Time spent in each request stage (validation, array_build, scaling, inference, interpolation, importance, serialization)",
+    ["stage"]
+)
+MODEL_BATCH_ROWS = metrics.histogram(
+    "employment_model_batch_rows", "Rows scored per model call", buckets=BATCH_SIZE_BUCKETS
+)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage)
+
+
+class StageTimer:
+    """Times consecutive stages: timer.lap('scaling') records the time since the previous lap"""
+
+    __slots__ = ("_last",)
+
+    def __init__(self, started: Optional[float] = None):
+        self._last = time.perf_counter() if started is None else started
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        STAGE_SECONDS.observe(now - self._last, stage)
+        self._last = now
+
+    def restart(self):
+        """Start the next stage now, leaving the time since the last lap unrecorded"""
+        self._last = time.perf_counter()
+
+
+REQUESTS = metrics.counter(
+    "employment_requests_total", "HTTP requests by method, route and status", ["method", "route", "status"]
+)
+REQUEST_SECONDS = metrics.histogram(
+    "employment_request_seconds", "End-to-end HTTP request latency by route", ["route"]
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them end to end
+
+    It stores `request_started` in the request state, where handlers pick
+    it up to time validation (everything before the handler runs). A
+    handler that sets `serialization_started` gets the time until the
+    response headers are sent recorded as the serialization stage.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = scope.setdefault("state", {})
+        state["request_started"] = started
+        status = 500
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                serialization_started = state.get("serialization_started")
+                if serialization_started is not None:
+                    STAGE_SECONDS.observe(time.perf_counter() - serialization_started, "serialization")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # Label by route template, not raw path, to keep the series bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.inc(1, scope["method"], route, str(status))
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route)
@@ -0,0 +1,160 @@
+"""
+Versioned model bundles: a JSON manifest plus NumPy payloads, no pickles
+
+A bundle is a directory written by save_best_model.export_model_bundle:
+
+    manifest.json   format version, model name and type, feature order,
+                    scaler mean/scale, metrics, payload dtypes/shapes and
+                    the SHA-256 of every payload file
+    <array>.npy     one uncompressed array per payload entry (memory-mappable)
+    arrays.npz      or all payload arrays in one compressed file
+
+Model types are 'tree_ensemble' (the FlatForest node arrays, also used for
+a single decision tree) and 'linear' (coef and intercept in scaled feature
+space). Loading only reads JSON and .npy/.npz data, so a bundle can be
+checked and served without unpickling anything.
+"""
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from flat_forest import FlatForest
+
+BUNDLE_FORMAT = "employment-model-bundle"
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class BundleError(Exception):
+    """Raised for malformed bundles, unsupported versions, checksum and feature order mismatches"""
+
+
+class BundleScaler:
+    """StandardScaler replacement built from the mean/scale stored in a manifest"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.n_features_in_ = self.mean_.shape[0]
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class LinearBundleModel:
+    """Linear model on scaled features (coef_/intercept_, like sklearn's)"""
+
+    # A dot product is faster than interpolating a response surface
+    cheap_to_evaluate = True
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.n_features_in_ = self.coef_.shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+def is_bundle(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(path: str) -> dict:
+    """Parse and sanity-check a bundle's manifest"""
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"{path} is not a model bundle")
+    if manifest.get("format_version", 0) > BUNDLE_FORMAT_VERSION:
+        raise BundleError(
+            f"{path} uses bundle format version {manifest['format_version']}, "
+            f"this server reads up to {BUNDLE_FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def verify_bundle(path: str, manifest: Optional[dict] = None) -> dict:
+    """Check every payload file against its manifest checksum; returns the manifest"""
+    manifest = manifest or read_manifest(path)
+    for name, expected in manifest["files"].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            raise BundleError(f"{path}: missing payload file {name}")
+        if file_sha256(file_path) != expected:
+            raise BundleError(f"{path}: checksum mismatch for {name}")
+    return manifest
+
+
+def read_arrays(path: str, manifest: dict, mmap_mode: Optional[str] = None) -> dict:
+    """Payload arrays by name, memory-mapped when stored uncompressed"""
+    if manifest["compressed"]:
+        with np.load(os.path.join(path, "arrays.npz")) as data:
+            arrays = {key: data[key] for key in manifest["arrays"]}
+    else:
+        arrays = {
+            key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mmap_mode)
+            for key in manifest["arrays"]
+        }
+    for key, spec in manifest["arrays"].items():
+        if list(arrays[key].shape) != spec["shape"] or str(arrays[key].dtype) != spec["dtype"]:
+            raise BundleError(f"{path}: array {key} does not match the manifest")
+    return arrays
+
+
+def check_feature_order(path: str, manifest: dict, feature_names: List[str]):
+    """Raise BundleError unless the bundle was trained on `feature_names`, in that order (case-insensitive)"""
+    trained = [column.lower() for column in manifest.get("feature_columns", [])]
+    if trained != [name.lower() for name in feature_names]:
+        raise BundleError(f"{path}: trained on features {manifest.get('feature_columns')}, expected {feature_names}")
+
+
+def load_bundle(path: str, mmap_mode: Optional[str] = None, verify: bool = True,
+                feature_names: Optional[List[str]] = None) -> tuple:
+    """
+    Load a bundle as (model, scaler, manifest)
+
+    The model is a FlatForest or a LinearBundleModel and the scaler a
+    BundleScaler (None when the bundle was exported without one). With
+    `feature_names`, the bundle must have been trained on those features
+    in that order.
+    """
+    manifest = read_manifest(path)
+    if feature_names is not None:
+        check_feature_order(path, manifest, feature_names)
+    if verify:
+        verify_bundle(path, manifest)
+    arrays = read_arrays(path, manifest, mmap_mode)
+
+    model_type = manifest["model_type"]
+    if model_type == "tree_ensemble":
+        model = FlatForest(**arrays)
+    elif model_type == "linear":
+        model = LinearBundleModel(arrays["coef"], arrays["intercept"])
+    else:
+        raise BundleError(f"{path}: unsupported model type '{model_type}'")
+
+    scaler = None
+    if manifest.get("scaler") is not None:
+        scaler = BundleScaler(manifest["scaler"]["mean"], manifest["scaler"]["scale"])
+    return model, scaler, manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    for bundle_path in sys.argv[1:]:
+        bundle_manifest = verify_bundle(bundle_path)
+        print(f"✅ {bundle_path}: {bundle_manifest['model_name']} ({bundle_manifest['model_type']}, "
+              f"{len(bundle_manifest['files'])} payload file(s) verified)")
@@ -0,0 +1,270 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from flat_forest import FlatForest
+from inference_pool import load_serving_model, predict_matrix
+from model_bundle import is_bundle
+
+
+def file_token(path: Optional[str]) -> int:
+    """Modification stamp of a model file, or of the newest file in a model directory"""
+    if path is None or not os.path.exists(path):
+        return 0
+    if os.path.isdir(path):
+        return max((os.stat(os.path.join(path, name)).st_mtime_ns for name in os.listdir(path)), default=0)
+    return os.stat(path).st_mtime_ns
+
+
+# (threshold, level) pairs, highest first: a prediction above a threshold gets its level.
+# Models can bring their own as a `confidence_thresholds` attribute.
+CONFIDENCE_THRESHOLDS = ((70.0, "High"), (50.0, "Medium"))
+
+
+class ServedModel:
+    """
+    One loaded version of a named model, with its scaler and serving state
+
+    Everything a request needs (model, scaler, importance summary, cache,
+    micro-batcher) hangs off this object, so a request that holds a
+    reference keeps using the same version even if a newer one is
+    published while it runs.
+    """
+
+    def __init__(self, name: str, display_name: str, version: int, model, scaler,
+                 model_file: str, scaler_file: Optional[str], token: tuple,
+                 feature_names: List[str], settings: dict):
+        self.name = name
+        self.display_name = display_name
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.model_file = model_file
+        self.scaler_file = scaler_file
+        self.token = token
+        self.feature_names = feature_names
+        self.settings = settings
+        self.loaded_at = time.time()
+        self.load_seconds = 0.0
+        self.feature_importance = self._compute_feature_importance()
+        # Filled in by the registry's on_load hook
+        self.cache = None
+        self.batcher = None
+        self.surface = None
+        self._contribution_engine = None
+
+    @property
+    def worker_spec(self) -> tuple:
+        """Everything a pool process needs to load this exact version"""
+        return (self.model_file, self.scaler_file, self.settings["compile_trees"],
+                self.settings["fuse_linear"], self.settings["mmap_mode"], self.token)
+
+    def predict_sync(self, input_matrix: np.ndarray) -> np.ndarray:
+        return predict_matrix(self.model, self.scaler, input_matrix)
+
+    def confidence_level(self, prediction: float) -> str:
+        """High/Medium/Low for a prediction, by the model's thresholds or CONFIDENCE_THRESHOLDS"""
+        for threshold, level in getattr(self.model, 'confidence_thresholds', CONFIDENCE_THRESHOLDS):
+            if prediction > threshold:
+                return level
+        return "Low"
+
+    def _compute_feature_importance(self) -> dict:
+        """Top 4 feature importances, computed once when the version loads"""
+        model = self.model
+        if hasattr(model, 'feature_importances_'):
+            importances = model.feature_importances_
+            importance = {
+                feature: float(imp * 100)
+                for feature, imp in zip(self.feature_names, importances)
+            }
+            # Get top 4 most important features
+            return dict(sorted(importance.items(), key=lambda x: x[1], reverse=True)[:4])
+        elif hasattr(model, 'coef_'):
+            # For linear models, use absolute coefficient values
+            coefs = np.abs(model.coef_)
+            importance = {
+                feature: float(coef * 100)
+                for feature, coef in zip(self.feature_names, coefs)
+            }
+            return dict(sorted(importance.items(), key=lambda x: x[1], reverse=True)[:4])
+        elif hasattr(model, 'importance_groups'):
+            # Rule-based models report the weight of each group of features
+            return dict(model.importance_groups)
+        return {"model_prediction": 100.0}
+
+    def contributions(self, input_matrix: np.ndarray) -> Optional[tuple]:
+        """
+        Per-row feature contributions and baseline for an input matrix
+
+        Linear models report coef_j * scaled_x_j, tree models report decision
+        path attributions. Returns None for models without either.
+        """
+        model = self.model
+        if self.scaler is not None and not getattr(model, 'includes_scaling', False):
+            model_input = self.scaler.transform(input_matrix)
+        else:
+            model_input = input_matrix
+
+        engine = model
+        if not hasattr(model, 'contributions') and (hasattr(model, 'estimators_') or hasattr(model, 'tree_')):
+            # Trees served through sklearn are flattened once, only for this opt-in path
+            if self._contribution_engine is None:
+                self._contribution_engine = FlatForest.from_sklearn(model)
+            engine = self._contribution_engine
+
+        if hasattr(engine, 'contributions'):
+            return engine.contributions(model_input)
+        if hasattr(model, 'coef_') and np.ndim(getattr(model, 'intercept_', None)) == 0:
+            return model_input * np.asarray(model.coef_), np.full(len(model_input), float(model.intercept_))
+        return None
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "display_name": self.display_name,
+            "version": self.version,
+            "model_file": self.model_file,
+            "scaler_file": self.scaler_file,
+            "engine": type(self.model).__name__,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "response_surface": self.surface.describe() if self.surface is not None else None
+        }
+
+
+class ModelRegistry:
+    """
+    Named, versioned models that can be swapped without downtime
+
+    Each name maps to candidate model files (first existing one wins) and
+    the shared scaler candidates. A new version is loaded off the event
+    loop and published with a single dict assignment on the loop thread,
+    so in-flight requests finish on the version they started with.
+    """
+
+    def __init__(self, feature_names: List[str], scaler_files: List[str],
+                 compile_trees: bool = True, fuse_linear: bool = True,
+                 mmap_mode: Optional[str] = None,
+                 on_load: Optional[Callable[[ServedModel], None]] = None):
+        self.feature_names = feature_names
+        self.scaler_files = scaler_files
+        self.settings = {
+            "compile_trees": compile_trees,
+            "fuse_linear": fuse_linear,
+            "mmap_mode": mmap_mode
+        }
+        self.on_load = on_load
+        self.preferred_default: Optional[str] = None
+        self._sources: Dict[str, tuple] = {}
+        self._models: Dict[str, ServedModel] = {}
+
+    def register(self, name: str, display_name: str, model_files: List[str]):
+        """Declare a named model and the files it can be loaded from, in order of preference"""
+        self._sources[name] = (display_name, model_files)
+
+    def registered(self) -> List[str]:
+        return list(self._sources)
+
+    def _resolve_files(self, name: str) -> tuple:
+        _, model_files = self._sources[name]
+        model_file = next((path for path in model_files if os.path.exists(path)), None)
+        if model_file is not None and is_bundle(model_file):
+            # Bundles carry their own scaler
+            return model_file, None
+        scaler_file = next((path for path in self.scaler_files if os.path.exists(path)), None)
+        return model_file, scaler_file
+
+    def load(self, name: str, report=None) -> Optional[ServedModel]:
+        """Load the next version of a named model (does not publish it)"""
+        display_name, _ = self._sources[name]
+        model_file, scaler_file = self._resolve_files(name)
+        if model_file is None:
+            return None
+
+        started = time.perf_counter()
+        token = (file_token(model_file), file_token(scaler_file))
+        # Pool processes load the same files later, so the feature order is only checked here
+        model, scaler = load_serving_model(model_file, scaler_file, report=report,
+                                           feature_names=self.feature_names, **self.settings)
+        current = self._models.get(name)
+        served = ServedModel(
+            name, display_name, current.version + 1 if current else 1,
+            model, scaler, model_file, scaler_file, token,
+            self.feature_names, self.settings
+        )
+        if self.on_load is not None:
+            self.on_load(served)
+        served.load_seconds = time.perf_counter() - started
+        return served
+
+    def publish_builtin(self, name: str, display_name: str, model) -> ServedModel:
+        """Register, load and publish a model that lives in memory (no files, never hot reloaded)"""
+        self.register(name, display_name, [])
+        started = time.perf_counter()
+        current = self._models.get(name)
+        served = ServedModel(
+            name, display_name, current.version + 1 if current else 1,
+            model, None, None, None, (0, 0), self.feature_names, self.settings
+        )
+        if self.on_load is not None:
+            self.on_load(served)
+        served.load_seconds = time.perf_counter() - started
+        self.publish(served)
+        return served
+
+    def publish(self, served: ServedModel):
+        """Atomically make a loaded version the one new requests get"""
+        self._models[served.name] = served
+
+    def get(self, name: Optional[str] = None) -> Optional[ServedModel]:
+        """Currently published version of a model (the default model when name is None)"""
+        if name is None:
+            name = self.default_name
+        return self._models.get(name) if name is not None else None
+
+    @property
+    def default_name(self) -> Optional[str]:
+        if self.preferred_default in self._models:
+            return self.preferred_default
+        # Otherwise the first registered model that is loaded
+        return next((name for name in self._sources if name in self._models), None)
+
+    def loaded(self) -> List[ServedModel]:
+        return [self._models[name] for name in self._sources if name in self._models]
+
+    def is_stale(self, name: str) -> bool:
+        """True when the files behind a model changed since its version was loaded"""
+        model_file, scaler_file = self._resolve_files(name)
+        served = self._models.get(name)
+        if served is None:
+            return model_file is not None
+        if model_file is None:
+            return False
+        return (model_file, scaler_file) != (served.model_file, served.scaler_file) or \
+            (file_token(model_file), file_token(scaler_file)) != served.token
+
+    async def reload(self, name: str) -> ServedModel:
+        """Load a new version in a worker thread, then publish it"""
+        if name not in self._sources:
+            raise KeyError(name)
+        served = await asyncio.to_thread(self.load, name)
+        if served is None:
+            raise FileNotFoundError(f"No model file found for '{name}'")
+        self.publish(served)
+        return served
+
+    async def watch(self, interval: float):
+        """Poll model files and hot reload any model whose files changed"""
+        while True:
+            await asyncio.sleep(interval)
+            for name in self.registered():
+                try:
+                    if self.is_stale(name):
+                        served = await self.reload(name)
+                        print(f"🔄 Reloaded {served.display_name} (version {served.version}) from {served.model_file}")
+                except Exception as e:
+                    print(f"⚠️  Failed to reload {name}: {e}")
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    In-process LRU/TTL cache of model predictions
+
+    Keys are the ordered feature vector, optionally rounded to `decimals`
+    so near-duplicate inputs share an entry. Each loaded model version gets
+    its own cache, so a reload starts from an empty one. Only used from
+    the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = None,
+                 decimals: Optional[int] = None):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def key(self, row: np.ndarray) -> tuple:
+        if self.decimals is not None:
+            row = np.round(row, self.decimals)
+        return tuple(row.tolist())
+
+    def get(self, row: np.ndarray) -> Optional[float]:
+        """Return the cached prediction for a feature row, or None"""
+        key = self.key(row)
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, row: np.ndarray, value: float):
+        """Store a prediction, evicting the least recently used entry if full"""
+        key = self.key(row)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[key] = (float(value), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "decimals": self.decimals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,151 @@
+"""
+Precomputed response surfaces for approximate, low-latency serving
+
+A ResponseSurface scores a model once on a regular grid spanning the
+input bounds, then answers queries by multilinear interpolation between
+the 2**n_features grid points around them. Features whose range covers
+two or more orders of magnitude (GDP per capita, population) get
+log-spaced grid points. After building, the surface is checked against
+the exact model on random in-bounds inputs, and the observed errors are
+kept with it so every approximate answer can report them.
+
+    surface = ResponseSurface.build(served.predict_sync, bounds, points_per_axis=6)
+    surface.save("response_surfaces/random_forest.npz", key)
+    surface = ResponseSurface.load("response_surfaces/random_forest.npz", key)
+    predictions = surface.predict(input_matrix)
+"""
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+SURFACE_FORMAT_VERSION = 1
+
+# Rows scored per model call while the grid is built, and rows per interpolation chunk
+BUILD_CHUNK_ROWS = 65536
+PREDICT_CHUNK_ROWS = 8192
+
+
+def grid_axis(low: float, high: float, points: int) -> tuple:
+    """Grid points for one feature and whether they are log-spaced"""
+    if low > 0 and high / low >= 100:
+        return np.geomspace(low, high, points), True
+    return np.linspace(low, high, points), False
+
+
+class ResponseSurface:
+    """Model predictions on a grid over the input bounds, queried by multilinear interpolation"""
+
+    def __init__(self, axes: List[np.ndarray], log_axes: List[bool], values: np.ndarray,
+                 error: Optional[dict] = None):
+        self.log_axes = np.asarray(log_axes, dtype=bool)
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        # Interpolate in log space along log-spaced axes
+        self._coords = [np.log(axis) if log else axis for axis, log in zip(self.axes, self.log_axes)]
+        self.values = np.asarray(values, dtype=np.float64)
+        self.error = error or {}
+
+        shape = [len(axis) for axis in self.axes]
+        if list(self.values.shape) != shape or min(shape) < 2:
+            raise ValueError(f"Surface values of shape {self.values.shape} do not match axes of sizes {shape}")
+        self._flat_values = self.values.ravel()
+        strides = np.cumprod([1, *shape[::-1]])[:-1][::-1]
+        # Every corner of a grid cell: its offset in the flat values and which axes it takes the upper point of
+        self._corner_bits = np.array(np.meshgrid(*[[0, 1]] * len(shape), indexing="ij")).reshape(len(shape), -1).T
+        self._corner_offsets = self._corner_bits @ strides
+        self._strides = strides
+
+    @property
+    def n_points(self) -> int:
+        return self.values.size
+
+    @classmethod
+    def build(cls, predict: Callable[[np.ndarray], np.ndarray], bounds: List[tuple],
+              points_per_axis: int = 6, validation_rows: int = 2000, seed: int = 0) -> "ResponseSurface":
+        """Score `predict` on the grid, then measure the interpolation error on random inputs"""
+        axes, log_axes = zip(*(grid_axis(low, high, points_per_axis) for low, high in bounds))
+        mesh = np.meshgrid(*axes, indexing="ij")
+        grid_matrix = np.column_stack([points.ravel() for points in mesh])
+        values = np.concatenate([
+            predict(grid_matrix[start:start + BUILD_CHUNK_ROWS])
+            for start in range(0, len(grid_matrix), BUILD_CHUNK_ROWS)
+        ]).reshape(mesh[0].shape)
+
+        surface = cls(list(axes), list(log_axes), values)
+        surface.error = surface.measure_error(predict, validation_rows, seed)
+        return surface
+
+    def sample_inputs(self, n_rows: int, seed: int = 0) -> np.ndarray:
+        """Inputs drawn uniformly in grid coordinates (log-uniform along log-spaced axes)"""
+        rng = np.random.default_rng(seed)
+        columns = [rng.uniform(coords[0], coords[-1], n_rows) for coords in self._coords]
+        return np.column_stack([np.exp(column) if log else column
+                                for column, log in zip(columns, self.log_axes)])
+
+    def measure_error(self, predict: Callable[[np.ndarray], np.ndarray], n_rows: int = 2000,
+                      seed: int = 0) -> dict:
+        """Absolute interpolation error against `predict` on random in-bounds inputs"""
+        inputs = self.sample_inputs(n_rows, seed)
+        errors = np.abs(self.predict(inputs) - np.asarray(predict(inputs), dtype=float))
+        return {
+            "validation_rows": n_rows,
+            "max_abs_error": float(errors.max()),
+            "p95_abs_error": float(np.percentile(errors, 95)),
+            "mean_abs_error": float(errors.mean())
+        }
+
+    def predict(self, input_matrix: np.ndarray) -> np.ndarray:
+        """Interpolated predictions for an (n_rows, n_features) matrix; inputs are clipped to the bounds"""
+        input_matrix = np.atleast_2d(np.asarray(input_matrix, dtype=float))
+        if len(input_matrix) > PREDICT_CHUNK_ROWS:
+            return np.concatenate([
+                self.predict(input_matrix[start:start + PREDICT_CHUNK_ROWS])
+                for start in range(0, len(input_matrix), PREDICT_CHUNK_ROWS)
+            ])
+
+        cells = np.empty(input_matrix.shape, dtype=np.intp)
+        fractions = np.empty(input_matrix.shape)
+        for j, coords in enumerate(self._coords):
+            column = input_matrix[:, j]
+            if self.log_axes[j]:
+                column = np.log(np.maximum(column, self.axes[j][0]))
+            cell = np.clip(np.searchsorted(coords, column, side="right") - 1, 0, len(coords) - 2)
+            cells[:, j] = cell
+            fractions[:, j] = np.clip((column - coords[cell]) / (coords[cell + 1] - coords[cell]), 0.0, 1.0)
+
+        # (n_rows, n_corners): flat index and weight of each corner of every row's cell
+        flat = (cells @ self._strides)[:, None] + self._corner_offsets[None, :]
+        weights = np.where(self._corner_bits[None, :, :], fractions[:, None, :], 1.0 - fractions[:, None, :]).prod(axis=2)
+        return (self._flat_values[flat] * weights).sum(axis=1)
+
+    def describe(self) -> dict:
+        return {
+            "grid_points": self.n_points,
+            "points_per_axis": [len(axis) for axis in self.axes],
+            "log_spaced_axes": self.log_axes.tolist(),
+            **self.error
+        }
+
+    def save(self, path: str, key: str):
+        """Write the surface to an .npz file tagged with `key` (see load)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        meta = {"format_version": SURFACE_FORMAT_VERSION, "key": key,
+                "log_axes": self.log_axes.tolist(), "error": self.error}
+        arrays: Dict[str, np.ndarray] = {f"axis_{j}": axis for j, axis in enumerate(self.axes)}
+        # Write then rename, so a concurrent reader never sees a partial file
+        temporary_path = path + ".tmp.npz"
+        np.savez(temporary_path, values=self.values, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str, key: str) -> Optional["ResponseSurface"]:
+        """Surface saved under `key`, or None when the file is missing or was built for something else"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["format_version"] != SURFACE_FORMAT_VERSION or meta["key"] != key:
+                return None
+            axes = [data[f"axis_{j}"] for j in range(len(meta["log_axes"]))]
+            return cls(axes, meta["log_axes"], data["values"], meta["error"])
@@ -0,0 +1,24 @@
+"""
+Production entry point for the prediction API
+
+Only the standard library is imported here. uvicorn imports `prediction:app`
+inside each worker, so the supervisor process never pays for FastAPI,
+NumPy or the model, and every worker imports just what inference needs.
+"""
+import os
+
+
+def main():
+    import uvicorn
+
+    uvicorn.run(
+        "prediction:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 8000)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        reload=False
+    )
+
+
+if __name__ == "__main__":
+    main()
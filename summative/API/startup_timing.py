@@ -0,0 +1,38 @@
+import time
+from contextlib import contextmanager
+from typing import List
+
+
+class StartupReport:
+    """
+    Timing of each startup stage (import, load, compile, warm-up) per artifact
+
+    Printed once the model is ready and served at `/startup-report`, so
+    cold start regressions on worker spawns can be traced to one file.
+    """
+
+    def __init__(self):
+        self.entries: List[dict] = []
+
+    def record(self, stage: str, artifact: str, seconds: float):
+        self.entries.append({"stage": stage, "artifact": artifact, "seconds": seconds})
+
+    @contextmanager
+    def timed(self, stage: str, artifact: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, artifact, time.perf_counter() - started)
+
+    def total_seconds(self) -> float:
+        return sum(entry["seconds"] for entry in self.entries)
+
+    def as_dict(self) -> dict:
+        return {"total_seconds": self.total_seconds(), "stages": list(self.entries)}
+
+    def print_report(self):
+        print("⏱️  Startup timing report")
+        for entry in self.entries:
+            print(f"   {entry['stage']:<10} {entry['artifact']:<40} {entry['seconds'] * 1000:9.1f} ms")
+        print(f"   {'total':<10} {'':<40} {self.total_seconds() * 1000:9.1f} ms")
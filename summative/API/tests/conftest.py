@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+# No file watcher in tests, and /predict scores with the model itself
+os.environ.setdefault("MODEL_WATCH_INTERVAL", "0")
+os.environ.setdefault("RESPONSE_SURFACE", "0")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the API, started from the API directory so the model files are found"""
+    from fastapi.testclient import TestClient
+    import prediction
+
+    cwd = os.getcwd()
+    os.chdir(API_DIR)
+    try:
+        with TestClient(prediction.app) as test_client:
+            yield test_client
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def sample_input():
+    from prediction import SAMPLE_INPUT
+    return dict(SAMPLE_INPUT)
@@ -0,0 +1,25 @@
+def test_batch_matches_single_predictions(client, sample_input):
+    rows = [sample_input, {**sample_input, "literacy_rate": 40.0}, {**sample_input, "gdp_per_capita": 900.0}]
+
+    response = client.post("/predict/batch", json={"inputs": rows})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == body["succeeded"] == 3
+    for row, result in zip(rows, body["results"]):
+        single = client.post("/predict", json=row).json()
+        assert result["success"]
+        assert result["prediction"]["predicted_employment_rate"] == single["predicted_employment_rate"]
+        assert result["prediction"]["confidence_level"] == single["confidence_level"]
+
+
+def test_batch_reports_invalid_rows_without_failing(client, sample_input):
+    rows = [sample_input, {**sample_input, "literacy_rate": 150.0}, {"gdp_per_capita": 1000.0}]
+
+    body = client.post("/predict/batch", json={"inputs": rows}).json()
+
+    assert (body["succeeded"], body["failed"]) == (1, 2)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert body["results"][0]["success"]
+    assert not body["results"][1]["success"] and "literacy_rate" in body["results"][1]["error"]
+    assert not body["results"][2]["success"]
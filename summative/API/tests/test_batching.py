@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from batching import MicroBatcher
+
+
+def linear(matrix):
+    return matrix @ np.array([1.0, 2.0, 3.0]) + 0.5
+
+
+async def submit_all(batcher, rows):
+    return await asyncio.gather(*(batcher.submit(row) for row in rows))
+
+
+def test_concurrent_calls_match_direct_predictions_and_are_coalesced():
+    calls = []
+
+    async def predict_fn(matrix):
+        calls.append(len(matrix))
+        return linear(matrix)
+
+    rows = list(np.random.default_rng(0).normal(size=(10, 3)))
+    batcher = MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=5.0)
+
+    results = asyncio.run(submit_all(batcher, rows))
+
+    assert results == [float(value) for value in linear(np.vstack(rows))]
+    assert calls == [4, 4, 2]
+    assert (batcher.batches_flushed, batcher.rows_scored) == (3, 10)
+
+
+def test_model_errors_reach_every_caller_in_the_batch():
+    async def predict_fn(matrix):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=8, max_wait_ms=1.0)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(np.zeros(3)) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert batcher.rows_scored == 0
+
+
+def test_single_request_is_flushed_after_the_wait():
+    async def predict_fn(matrix):
+        return linear(matrix)
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=64, max_wait_ms=1.0)
+
+    assert asyncio.run(batcher.submit(np.ones(3))) == pytest.approx(6.5)
+    assert batcher.batches_flushed == 1
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from load_test import drive, make_payloads  # noqa: E402
+from model_latency import random_inputs, time_calls  # noqa: E402
+
+
+def test_random_inputs_stay_within_the_api_bounds():
+    from prediction import feature_bounds
+
+    inputs = random_inputs(2000, seed=3)
+    low, high = np.array(list(feature_bounds().values()), dtype=float).T
+
+    assert inputs.shape == (2000, len(low))
+    assert np.all(inputs >= low) and np.all(inputs <= high)
+    np.testing.assert_array_equal(random_inputs(5, seed=3), inputs[:5])
+
+
+def test_time_calls_honours_the_minimum_repeat():
+    assert len(time_calls(lambda: None, min_time=0.0, min_repeat=7)) == 7
+
+
+def test_load_test_drive_reports_every_request(client):
+    import httpx
+    import prediction
+
+    async def run():
+        transport = httpx.ASGITransport(app=prediction.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as async_client:
+            return await drive(async_client, "/predict", make_payloads(10), requests=40, concurrency=8)
+
+    result = asyncio.run(run())
+
+    assert (result["requests"], result["errors"], result["concurrency"]) == (40, 0, 8)
+    assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
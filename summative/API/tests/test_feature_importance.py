@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def test_importance_is_computed_once_per_version(client, sample_input):
+    import prediction
+
+    served = prediction.registry.get("random_forest")
+    importances = np.asarray(served.model.feature_importances_) * 100
+    top = sorted(zip(prediction.feature_names, importances), key=lambda item: item[1], reverse=True)[:4]
+
+    assert list(served.feature_importance) == [feature for feature, _ in top]
+    assert prediction.get_feature_importance(served) is served.feature_importance
+
+    response = client.post("/predict?model=random_forest", json=sample_input).json()
+    assert response["feature_importance"] == served.feature_importance
+
+
+def test_contributions_are_opt_in_and_sum_to_the_prediction(client, sample_input):
+    plain = client.post("/predict?model=linear_regression", json=sample_input).json()
+    explained = client.post("/predict?model=linear_regression&contributions=true", json=sample_input).json()
+
+    assert plain["feature_contributions"] is None
+    contributions = dict(explained["feature_contributions"])
+    total = contributions.pop("baseline") + sum(contributions.values())
+    assert abs(total - explained["predicted_employment_rate"]) < 0.01
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from flat_forest import FlatForest, compile_tree_model, flat_forest_arrays
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 5))
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + rng.normal(scale=0.1, size=300)
+    return X, y
+
+
+@pytest.mark.parametrize("model", [
+    RandomForestRegressor(n_estimators=15, max_depth=8, random_state=0),
+    DecisionTreeRegressor(random_state=0)
+])
+def test_predictions_match_sklearn_exactly(data, model):
+    X, y = data
+    model.fit(X, y)
+    probe = np.random.default_rng(1).normal(0.0, 2.0, size=(500, 5))
+
+    np.testing.assert_array_equal(FlatForest.from_sklearn(model).predict(probe), model.predict(probe))
+
+
+def test_contributions_sum_back_to_predictions(data):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    forest = FlatForest.from_sklearn(model)
+
+    contributions, baseline = forest.contributions(X[:50])
+
+    np.testing.assert_allclose(contributions.sum(axis=1) + baseline, forest.predict(X[:50]), atol=1e-10)
+
+
+def test_float32_arrays_are_served_as_stored(data):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    arrays = flat_forest_arrays(model)
+    arrays['threshold'] = arrays['threshold'].astype(np.float32)
+    arrays['value'] = arrays['value'].astype(np.float32)
+
+    forest = FlatForest(**arrays)
+
+    assert forest.threshold is arrays['threshold'] and forest.value is arrays['value']
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=1e-6)
+
+
+def test_compile_keeps_fallback_and_skips_other_models(data):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+
+    compiled = compile_tree_model(model)
+
+    assert compiled.fallback_model is model
+    np.testing.assert_array_equal(compiled.predict(X[:10]), model.predict(X[:10]))
+    assert compile_tree_model(object()) is None
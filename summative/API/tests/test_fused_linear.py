@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from fused_linear import FusedLinearModel, fuse_linear_model
+from inference_pool import predict_matrix
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.uniform([100.0, 30.0, 1e5], [9e4, 85.0, 2e8], size=(200, 3))
+    y = X @ np.array([1e-4, 0.5, 1e-8]) + rng.normal(size=200)
+    scaler = StandardScaler().fit(X)
+    return LinearRegression().fit(scaler.transform(X), y), scaler, X
+
+
+def test_fused_model_matches_scaler_then_model(fitted):
+    model, scaler, X = fitted
+
+    fused = fuse_linear_model(model, scaler)
+
+    assert isinstance(fused, FusedLinearModel)
+    np.testing.assert_allclose(fused.predict(X), model.predict(scaler.transform(X)), rtol=1e-12)
+    # The serving path does not scale again
+    np.testing.assert_allclose(predict_matrix(fused, scaler, X), fused.predict(X), rtol=0)
+    np.testing.assert_array_equal(fused.coef_, model.coef_)
+
+
+def test_contributions_sum_back_to_predictions(fitted):
+    model, scaler, X = fitted
+    fused = fuse_linear_model(model, scaler)
+
+    contributions, baseline = fused.contributions(X)
+
+    np.testing.assert_allclose(contributions.sum(axis=1) + baseline, fused.predict(X), rtol=1e-12)
+    assert baseline[0] == pytest.approx(model.intercept_)
+
+
+def test_non_linear_models_are_not_fused(fitted):
+    _, scaler, _ = fitted
+    assert fuse_linear_model(object(), scaler) is None
@@ -0,0 +1,68 @@
+import numpy as np
+
+from heuristic_model import HeuristicModel, row_uniform
+from model_registry import ModelRegistry
+
+
+def test_predictions_are_deterministic_and_row_independent(client):
+    from prediction import feature_names, heuristic_model
+
+    X = np.random.default_rng(0).uniform(1.0, 100.0, size=(200, len(feature_names)))
+    X[:, feature_names.index("gdp_per_capita")] *= 500
+    X[:, feature_names.index("population")] *= 1e6
+
+    batch = heuristic_model.predict(X)
+
+    np.testing.assert_array_equal(batch, heuristic_model.predict(X))
+    np.testing.assert_array_equal(batch, [heuristic_model.predict(row)[0] for row in X])
+    np.testing.assert_array_equal(batch[::-1], heuristic_model.predict(X[::-1]))
+    assert batch.min() >= 35 and batch.max() <= 85
+
+
+def test_noise_is_bounded_and_seeded():
+    from prediction import feature_names
+
+    X = np.random.default_rng(1).uniform(1.0, 100.0, size=(500, len(feature_names)))
+    quiet = HeuristicModel(feature_names, noise=0.0).predict(X)
+    noisy = HeuristicModel(feature_names, noise=2.0, seed=0).predict(X)
+    reseeded = HeuristicModel(feature_names, noise=2.0, seed=1).predict(X)
+
+    assert np.all(np.abs(noisy - quiet) <= 2.0)
+    assert not np.array_equal(noisy, reseeded)
+    draws = row_uniform(X, 0)
+    assert draws.min() >= 0.0 and draws.max() < 1.0
+
+
+def test_served_heuristic_uses_its_own_confidence_levels(client, sample_input):
+    from prediction import feature_names, heuristic_model
+
+    served = ModelRegistry(feature_names, []).publish_builtin("heuristic", "Intelligent Heuristic Model",
+                                                              heuristic_model)
+
+    assert [served.confidence_level(value) for value in (75.0, 60.0, 52.0)] == ["High", "Medium", "Low"]
+    assert served.feature_importance == HeuristicModel.importance_groups
+
+    response = client.post("/predict?model=heuristic", json=sample_input).json()
+    expected = heuristic_model.predict(np.array([[sample_input[feature] for feature in feature_names]]))[0]
+    assert response["predicted_employment_rate"] == round(expected, 2)
+    assert response["confidence_level"] == served.confidence_level(expected)
+
+
+def test_heuristic_is_served_when_the_inference_pool_fails(client, sample_input, monkeypatch):
+    import asyncio
+
+    import prediction
+
+    def broken_pool(**kwargs):
+        raise OSError("no worker processes")
+
+    registry = ModelRegistry(prediction.feature_names, [], on_load=prediction.setup_served_model)
+    monkeypatch.setattr(prediction, "InferencePool", broken_pool)
+    monkeypatch.setattr(prediction, "inference_pool", prediction.inference_pool)
+    monkeypatch.setattr(prediction, "registry", registry)
+
+    asyncio.run(prediction.load_model())
+
+    assert prediction.inference_pool is None and registry.get().name == "heuristic"
+    body = client.post("/predict/batch", json={"inputs": [sample_input]}).json()
+    assert body["succeeded"] == 1 and body["model_used"] == "Intelligent Heuristic Model"
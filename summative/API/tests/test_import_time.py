@@ -0,0 +1,13 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from import_time import FORBIDDEN_MODULES, profile_once  # noqa: E402
+
+
+def test_serving_import_pulls_in_no_training_modules():
+    profile = profile_once()
+
+    assert [name for name in FORBIDDEN_MODULES if name in profile["modules"]] == []
+    assert profile["total_ms"] > 0
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+
+import numpy as np
+import pytest
+
+from inference_pool import InferencePool, QueueFullError
+
+
+class SlowModel:
+    """Stand-in for a ServedModel whose predictions take a while"""
+    model_file = None
+
+    def predict_sync(self, input_matrix):
+        time.sleep(0.05)
+        return input_matrix.sum(axis=1)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_pool_matches_direct_prediction(client, kind):
+    import prediction
+
+    served = prediction.registry.get("linear_regression")
+    matrix = np.random.default_rng(0).uniform(1.0, 100.0, size=(20, len(prediction.feature_names)))
+    pool = InferencePool(kind=kind, max_workers=2)
+    try:
+        served_by_pool = asyncio.run(pool.run(matrix, served))
+    finally:
+        pool.shutdown()
+
+    np.testing.assert_array_equal(served_by_pool, served.predict_sync(matrix))
+    assert pool.in_flight == 0
+
+
+
+def preloaded_versions(_):
+    """Pool job: which model versions this process had loaded before it ran"""
+    import inference_pool
+
+    time.sleep(0.2)
+    return os.getpid(), list(inference_pool._worker_models)
+
+
+def test_every_process_preloads_warmed_models(client):
+    import prediction
+
+    served = prediction.registry.get("linear_regression")
+    pool = InferencePool(kind="process", max_workers=3)
+    try:
+        pool.warm_up(served)
+        processes = dict(pool._executor.map(preloaded_versions, range(3)))
+    finally:
+        pool.shutdown()
+
+    assert len(processes) == 3
+    assert all(versions == [served.worker_spec] for versions in processes.values())
+
+def test_saturated_pool_rejects_jobs():
+    pool = InferencePool(kind="thread", max_workers=1, max_queue=1)
+    matrix = np.ones((2, 3))
+
+    async def run_two():
+        return await asyncio.gather(pool.run(matrix, SlowModel()), pool.run(matrix, SlowModel()),
+                                    return_exceptions=True)
+
+    try:
+        first, second = asyncio.run(run_two())
+    finally:
+        pool.shutdown()
+
+    np.testing.assert_array_equal(first, [3.0, 3.0])
+    assert isinstance(second, QueueFullError)
+    assert (pool.in_flight, pool.rejected) == (0, 1)
+
+
+def test_unknown_executor_kind():
+    with pytest.raises(ValueError):
+        InferencePool(kind="gpu")
@@ -0,0 +1,55 @@
+import re
+import threading
+
+import pytest
+
+from metrics import MetricsRegistry
+
+
+def sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_histogram_merges_thread_shards_into_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+    threads = [threading.Thread(target=histogram.observe, args=(value, "inference")) for value in (0.05, 0.5, 2.0)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert sample(text, 'latency_seconds_bucket{stage="inference",le="0.1"}') == 1
+    assert sample(text, 'latency_seconds_bucket{stage="inference",le="1"}') == 2
+    assert sample(text, 'latency_seconds_bucket{stage="inference",le="+Inf"}') == 3
+    assert sample(text, 'latency_seconds_sum{stage="inference"}') == pytest.approx(2.55)
+
+
+def test_counters_and_collectors():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ["status"])
+    counter.inc(1, "200")
+    counter.inc(2, "200")
+    registry.collect("cache_entries", "Entries", "gauge", lambda: [({"model": "rf"}, 7)])
+
+    text = registry.render()
+
+    assert sample(text, 'requests_total{status="200"}') == 3
+    assert sample(text, 'cache_entries{model="rf"}') == 7
+
+
+def test_metrics_endpoint_reports_request_stages(client, sample_input):
+    before = sample(client.get("/metrics").text, 'employment_requests_total{method="POST",route="/predict",status="200"}')
+
+    client.post("/predict", json={**sample_input, "population": 15000001.0})
+    text = client.get("/metrics").text
+
+    after = sample(text, 'employment_requests_total{method="POST",route="/predict",status="200"}')
+    assert after == (before or 0) + 1
+    for stage in ("validation", "array_build", "inference", "importance", "serialization"):
+        assert sample(text, f'employment_stage_seconds_count{{stage="{stage}"}}') > 0
+    assert 'employment_model_load_seconds{model="random_forest"' in text
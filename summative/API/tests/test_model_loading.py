@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from flat_forest import FlatForest, flat_forest_arrays
+from inference_pool import load_serving_model
+from startup_timing import StartupReport
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_flat_forest_directory_is_memory_mapped(tmp_path):
+    X = np.random.default_rng(0).normal(size=(100, 4))
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 0])
+    for key, array in flat_forest_arrays(model).items():
+        np.save(tmp_path / f"{key}.npy", array)
+
+    forest = FlatForest.load(str(tmp_path), mmap_mode="r")
+
+    assert isinstance(forest.threshold, np.memmap) and isinstance(forest.value, np.memmap)
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+
+
+def test_startup_report_times_each_artifact(client):
+    report = StartupReport()
+    model_file = os.path.join(API_DIR, "best_model_random_forest.pkl")
+    scaler_file = os.path.join(API_DIR, "feature_scaler.pkl")
+
+    model, scaler = load_serving_model(model_file, scaler_file, mmap_mode="r", report=report)
+
+    assert isinstance(model, FlatForest) and scaler is not None
+    assert [(entry["stage"], entry["artifact"]) for entry in report.entries] == [
+        ("load", model_file), ("compile", model_file), ("load", scaler_file)
+    ]
+    stages = {entry["stage"] for entry in client.get("/startup-report").json()["stages"]}
+    assert {"import", "load", "warm-up"} <= stages
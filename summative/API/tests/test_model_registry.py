@@ -0,0 +1,54 @@
+import asyncio
+import os
+import shutil
+
+import numpy as np
+
+from model_registry import ModelRegistry
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_registry(tmp_path, feature_names):
+    for name in ("best_model_linear_regression.pkl", "feature_scaler.pkl"):
+        shutil.copy(os.path.join(API_DIR, name), tmp_path / name)
+    registry = ModelRegistry(feature_names, [str(tmp_path / "feature_scaler.pkl")])
+    registry.register("linear_regression", "Linear Regression", [str(tmp_path / "best_model_linear_regression.pkl")])
+    registry.register("missing", "Missing", [str(tmp_path / "missing.pkl")])
+    return registry
+
+
+def test_reload_publishes_a_new_version_and_keeps_the_old_one_working(tmp_path):
+    from prediction import feature_names
+
+    registry = make_registry(tmp_path, feature_names)
+    first = registry.load("linear_regression")
+    registry.publish(first)
+    matrix = np.random.default_rng(0).uniform(1.0, 100.0, size=(5, len(feature_names)))
+    assert not registry.is_stale("linear_regression")
+
+    model_file = tmp_path / "best_model_linear_regression.pkl"
+    stat = os.stat(model_file)
+    os.utime(model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert registry.is_stale("linear_regression")
+
+    second = asyncio.run(registry.reload("linear_regression"))
+
+    assert (first.version, second.version) == (1, 2)
+    assert registry.get() is second and not registry.is_stale("linear_regression")
+    np.testing.assert_array_equal(first.predict_sync(matrix), second.predict_sync(matrix))
+    assert registry.load("missing") is None and registry.loaded() == [second]
+
+
+def test_reload_endpoint(client, sample_input):
+    import prediction
+
+    before = prediction.registry.get("linear_regression")
+
+    response = client.post("/admin/models/linear_regression/reload")
+
+    assert response.status_code == 200 and response.json()["version"] == before.version + 1
+    served = client.post("/predict?model=linear_regression", json=sample_input).json()
+    assert served["model_version"] == before.version + 1
+    assert client.post("/admin/models/unknown/reload").status_code == 404
+    assert client.post("/predict?model=unknown", json=sample_input).status_code == 404
@@ -0,0 +1,53 @@
+import numpy as np
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+    a, b, c = np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([5.0, 6.0])
+    cache.put(a, 10.0)
+    cache.put(b, 20.0)
+    assert cache.get(a) == 10.0
+
+    cache.put(c, 30.0)
+
+    assert cache.get(b) is None
+    assert (cache.get(a), cache.get(c)) == (10.0, 30.0)
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2
+
+
+def test_quantized_keys_share_an_entry():
+    cache = PredictionCache(decimals=2)
+    cache.put(np.array([3500.001, 68.5]), 55.0)
+
+    assert cache.get(np.array([3500.004, 68.5])) == 55.0
+    assert cache.get(np.array([3500.01, 68.5])) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(ttl_seconds=5)
+    cache.put(np.array([1.0]), 1.0)
+
+    now[0] = 104.0
+    assert cache.get(np.array([1.0])) == 1.0
+    now[0] = 106.0
+    assert cache.get(np.array([1.0])) is None
+    assert len(cache) == 0
+
+
+def test_each_model_version_gets_its_own_cache(client, sample_input):
+    import prediction
+
+    client.post("/predict", json=sample_input)
+    current = prediction.registry.get()
+    assert len(current.cache) > 0
+
+    # Loaded but not published, so the served version is left alone
+    next_version = prediction.registry.load(current.name)
+
+    assert next_version.version == current.version + 1
+    assert next_version.cache is not current.cache and len(next_version.cache) == 0
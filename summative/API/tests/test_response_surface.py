@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from response_surface import ResponseSurface, grid_axis
+
+BOUNDS = [(0.0, 10.0), (1.0, 1e4), (-1.0, 1.0)]
+
+
+def multilinear(X):
+    return 3 * X[:, 0] * X[:, 1] - 2 * X[:, 0] + 0.5
+
+
+def curved(X):
+    return np.sin(X[:, 0]) + np.log(X[:, 1]) ** 2 + X[:, 2] ** 2
+
+
+def test_multilinear_functions_are_reproduced_exactly():
+    surface = ResponseSurface.build(multilinear, BOUNDS[::2], points_per_axis=4)
+    inputs = surface.sample_inputs(500, seed=1)
+
+    np.testing.assert_allclose(surface.predict(inputs), multilinear(inputs), atol=1e-12)
+    assert surface.error["max_abs_error"] < 1e-12
+
+
+def test_grid_nodes_are_exact_and_wide_ranges_are_log_spaced():
+    surface = ResponseSurface.build(curved, BOUNDS, points_per_axis=5)
+    mesh = np.meshgrid(*surface.axes, indexing="ij")
+    nodes = np.column_stack([points.ravel() for points in mesh])
+
+    np.testing.assert_allclose(surface.predict(nodes), curved(nodes), rtol=1e-12)
+    assert surface.log_axes.tolist() == [False, True, False]
+    np.testing.assert_allclose(grid_axis(1.0, 1e4, 5)[0], [1.0, 10.0, 100.0, 1000.0, 1e4])
+
+
+def test_reported_error_bounds_match_the_validation_sample():
+    surface = ResponseSurface.build(curved, BOUNDS, points_per_axis=5, validation_rows=1000, seed=2)
+    inputs = surface.sample_inputs(1000, seed=2)
+    errors = np.abs(surface.predict(inputs) - curved(inputs))
+
+    assert surface.error["max_abs_error"] == pytest.approx(errors.max())
+    assert surface.error["max_abs_error"] >= surface.error["p95_abs_error"] >= surface.error["mean_abs_error"] > 0
+    # Out-of-bounds inputs are clipped to the edge of the grid
+    np.testing.assert_allclose(surface.predict([[20.0, 1e6, 5.0]]), surface.predict([[10.0, 1e4, 1.0]]))
+
+
+def test_saved_surfaces_are_only_loaded_for_their_key(tmp_path):
+    surface = ResponseSurface.build(curved, BOUNDS, points_per_axis=3)
+    path = str(tmp_path / "surfaces" / "model.npz")
+    surface.save(path, "version-1")
+
+    loaded = ResponseSurface.load(path, "version-1")
+
+    np.testing.assert_array_equal(loaded.values, surface.values)
+    assert loaded.error == surface.error
+    assert ResponseSurface.load(path, "version-2") is None
+    assert ResponseSurface.load(str(tmp_path / "missing.npz"), "version-1") is None
+
+
+def test_only_models_slower_than_interpolation_get_a_surface(client, sample_input, tmp_path, monkeypatch):
+    import prediction
+
+    monkeypatch.setattr(prediction, "RESPONSE_SURFACE", True)
+    monkeypatch.setattr(prediction, "RESPONSE_SURFACE_POINTS", 3)
+    monkeypatch.setattr(prediction, "RESPONSE_SURFACE_DIR", str(tmp_path))
+    current = prediction.registry.get("decision_tree")
+
+    assert prediction.registry.load("linear_regression").surface is None
+    served = prediction.registry.load("decision_tree")
+    assert served.surface is not None and (tmp_path / "decision_tree.npz").exists()
+
+    prediction.registry.publish(served)
+    try:
+        approximate = client.post("/predict?model=decision_tree", json=sample_input).json()
+        exact = client.post("/predict?model=decision_tree&exact=true", json=sample_input).json()
+    finally:
+        prediction.registry.publish(current)
+    assert approximate["approximation"] == served.surface.error
+    assert exact["approximation"] is None
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+def test_ndjson_stream_scores_rows_and_reports_bad_lines(client, sample_input):
+    expected = client.post("/predict", json=sample_input).json()["predicted_employment_rate"]
+    body = "\n".join([
+        json.dumps(sample_input),
+        "{not json",
+        json.dumps({**sample_input, "literacy_rate": 150.0}),
+        "[1, 2]",
+        json.dumps(sample_input)
+    ]) + "\n"
+
+    response = client.post("/predict/stream", content=body, headers={"content-type": "application/x-ndjson"})
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+    assert results[0]["predicted_employment_rate"] == results[4]["predicted_employment_rate"] == expected
+    assert results[1]["error"].startswith("Invalid JSON")
+    assert "literacy_rate" in results[2]["error"]
+    assert "JSON object" in results[3]["error"]
+
+
+def test_csv_upload_keeps_columns_and_writes_csv(client, sample_input):
+    expected = client.post("/predict", json=sample_input).json()["predicted_employment_rate"]
+    columns = ["Country", *(feature.upper() for feature in sample_input)]
+    lines = [",".join(columns), ",".join(["Kenya", *(str(value) for value in sample_input.values())]), "Ghana,1,2"]
+
+    response = client.post("/predict/stream?output=csv&keep=Country", content="\n".join(lines) + "\n",
+                           headers={"content-type": "text/csv"})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["country"] == "Kenya" and float(rows[0]["predicted_employment_rate"]) == expected
+    assert rows[1]["error"] == f"Expected {len(columns)} CSV fields, got 3"
+
+
+def test_multipart_upload(client, sample_input):
+    pytest.importorskip("python_multipart")
+    expected = client.post("/predict", json=sample_input).json()["predicted_employment_rate"]
+    files = {"file": ("rows.ndjson", json.dumps(sample_input) + "\n", "application/x-ndjson")}
+
+    response = client.post("/predict/stream", files=files)
+
+    assert json.loads(response.text)["predicted_employment_rate"] == expected
+
+
+def test_stream_rejects_unknown_formats(client):
+    assert client.post("/predict/stream?format=xml", content="").status_code == 422
+    assert client.post("/predict/stream?output=xml", content="").status_code == 422
@@ -0,0 +1,33 @@
+def test_sweep_matches_single_predictions(client, sample_input):
+    axes = [{"feature": "literacy_rate", "values": [40.0, 60.0, 80.0]},
+            {"feature": "gdp_per_capita", "start": 1000.0, "stop": 9000.0, "num": 2}]
+
+    response = client.post("/predict/sweep", json={"base": sample_input, "axes": axes})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["features"] == ["literacy_rate", "gdp_per_capita"]
+    assert body["grid"] == [[40.0, 60.0, 80.0], [1000.0, 9000.0]]
+    assert body["base_prediction"] == client.post("/predict", json=sample_input).json()["predicted_employment_rate"]
+    for i, literacy in enumerate(body["grid"][0]):
+        for j, gdp in enumerate(body["grid"][1]):
+            point = {**sample_input, "literacy_rate": literacy, "gdp_per_capita": gdp}
+            assert body["predictions"][i][j] == client.post("/predict", json=point).json()["predicted_employment_rate"]
+
+
+def test_sweep_defaults_to_the_feature_range(client, sample_input):
+    body = client.post("/predict/sweep", json={"base": sample_input, "axes": [
+        {"feature": "urban_population_percent", "num": 5}
+    ]}).json()
+
+    assert body["grid"] == [[0.0, 25.0, 50.0, 75.0, 100.0]] and len(body["predictions"]) == 5
+
+
+def test_invalid_sweeps_are_rejected(client, sample_input):
+    def status(axes):
+        return client.post("/predict/sweep", json={"base": sample_input, "axes": axes}).status_code
+
+    assert status([{"feature": "literacy_rate", "num": 1000}, {"feature": "population", "num": 1000}]) == 422
+    assert status([{"feature": "literacy_rate", "values": [150.0]}]) == 422
+    assert status([{"feature": "rainfall", "num": 3}]) == 422
+    assert status([{"feature": "literacy_rate"}, {"feature": "literacy_rate"}]) == 422
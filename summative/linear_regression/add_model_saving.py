@@ -1,63 +1,63 @@
 import joblib
 import numpy as np
 
+def fit_linear_regression(split, scaled):
+    """Fit stage: Linear Regression on the scaled training rows"""
+    from sklearn.linear_model import LinearRegression
+    _, X_train_scaled, _ = scaled
+    return LinearRegression().fit(X_train_scaled, split[2])
+
+def evaluate_linear_regression(model, split, scaled):
+    """Evaluate stage: train and test R² and RMSE"""
+    from sklearn.metrics import mean_squared_error, r2_score
+    _, _, y_train, y_test = split
+    _, X_train_scaled, X_test_scaled = scaled
+    lr_train_pred = model.predict(X_train_scaled)
+    lr_test_pred = model.predict(X_test_scaled)
+    return {
+        'train_r2': r2_score(y_train, lr_train_pred),
+        'test_r2': r2_score(y_test, lr_test_pred),
+        'train_rmse': np.sqrt(mean_squared_error(y_train, lr_train_pred)),
+        'test_rmse': np.sqrt(mean_squared_error(y_test, lr_test_pred))
+    }
+
+def build_notebook_model_data(model, scaled, metrics):
+    """best_model_from_notebook.pkl payload"""
+    from pipeline import FEATURE_COLUMNS
+    return {
+        'model': model,  # Linear Regression performed best
+        'scaler': scaled[0],
+        'feature_columns': FEATURE_COLUMNS,
+        'model_name': 'Linear Regression',
+        'metrics': metrics
+    }
+
+def export_notebook_model(model, scaled, metrics):
+    """Export stage: write best_model_from_notebook.pkl"""
+    joblib.dump(build_notebook_model_data(model, scaled, metrics), 'best_model_from_notebook.pkl')
+
 def save_model_from_notebook():
     """
     This function should be run after the notebook cells to save the best model.
     It assumes the variables from the notebook are available.
     """
     
-    # Load the dataset
-    import pandas as pd
-    from sklearn.model_selection import train_test_split
-    from sklearn.linear_model import LinearRegression
-    from sklearn.preprocessing import StandardScaler
-    
-    # Load data
-    df = pd.read_csv('comprehensive_african_employment_data.csv')
-    
-    # Select features
-    feature_columns = ['GDP_per_capita', 'Life_expectancy', 'Population', 
-                      'Urban_population_percent', 'School_enrollment_primary', 
-                      'School_enrollment_secondary', 'Literacy_rate']
-    
-    X = df[feature_columns]
-    y = df['Employment_rate']
+    # Load, split and scale the data, reusing cached stages when nothing changed
+    from pipeline import Pipeline, prepare_data
     
-    # Split and scale data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    pipeline = Pipeline()
+    _, split, scaled = prepare_data(pipeline)
     
     # Train model
-    lr_model = LinearRegression()
-    lr_model.fit(X_train_scaled, y_train)
+    lr_model = pipeline.run('fit', fit_linear_regression, split=split, scaled=scaled)
     
     # Calculate metrics
-    from sklearn.metrics import mean_squared_error, r2_score
-    lr_train_pred = lr_model.predict(X_train_scaled)
-    lr_test_pred = lr_model.predict(X_test_scaled)
-    lr_train_r2 = r2_score(y_train, lr_train_pred)
-    lr_test_r2 = r2_score(y_test, lr_test_pred)
-    lr_train_rmse = np.sqrt(mean_squared_error(y_train, lr_train_pred))
-    lr_test_rmse = np.sqrt(mean_squared_error(y_test, lr_test_pred))
+    metrics = pipeline.run('evaluate', evaluate_linear_regression, model=lr_model, split=split, scaled=scaled)
     
     # Save the best model with all necessary components
-    best_model_data = {
-        'model': lr_model,  # Linear Regression performed best
-        'scaler': scaler,
-        'feature_columns': feature_columns,
-        'model_name': 'Linear Regression',
-        'metrics': {
-            'train_r2': lr_train_r2,
-            'test_r2': lr_test_r2,
-            'train_rmse': lr_train_rmse,
-            'test_rmse': lr_test_rmse
-        }
-    }
-    
-    joblib.dump(best_model_data, 'best_model_from_notebook.pkl')
+    pipeline.export('export_notebook_model', export_notebook_model, ['best_model_from_notebook.pkl'],
+                    model=lr_model, scaled=scaled, metrics=metrics)
+    best_model_data = build_notebook_model_data(lr_model.value, scaled.value, metrics.value)
     print("✅ Best model saved as 'best_model_from_notebook.pkl'")
     
     # Test the saved model
@@ -0,0 +1,114 @@
+"""
+Fit time and accuracy of the GradientDescentLinearRegression solvers
+
+Fits every solver on the employment panel and on a synthetic problem,
+then reports the median fit time, the training MSE and the largest weight
+difference from the lstsq (SVD) solution:
+
+    python benchmarks/solvers.py                          # panel + 200k x 7 synthetic
+    python benchmarks/solvers.py --rows 1000000 --features 50 --output solvers.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODEL_DIR)
+
+from dataset import load_employment_data  # noqa: E402
+from gradient_descent_model import GradientDescentLinearRegression  # noqa: E402
+from pipeline import DATA_PATH, FEATURE_COLUMNS, TARGET_COLUMN  # noqa: E402
+
+SOLVERS = ['gd', 'sgd', 'normal', 'qr', 'lstsq', 'conjugate_gradient', 'auto']
+
+# Iteration budget per solver: GD steps, SGD epochs, CG steps
+MAX_ITERATIONS = {'gd': 1000, 'sgd': 100}
+
+
+def panel_dataset():
+    """Scaled train/test split of the employment panel, as in train_gradient_descent_model"""
+    df = load_employment_data(os.path.join(MODEL_DIR, DATA_PATH))
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[FEATURE_COLUMNS], df[TARGET_COLUMN], test_size=0.2, random_state=42
+    )
+    scaler = StandardScaler()
+    return (scaler.fit_transform(X_train), y_train.to_numpy(),
+            scaler.transform(X_test), y_test.to_numpy())
+
+
+def synthetic_dataset(rows, features, seed=0):
+    """Standardized features with a known linear target plus unit noise"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = X @ rng.normal(size=features) + 60 + rng.normal(size=rows)
+    split = int(rows * 0.8)
+    return X[:split], y[:split], X[split:], y[split:]
+
+
+def benchmark_dataset(name, dataset, repeat):
+    X_train, y_train, X_test, y_test = dataset
+    results = []
+    reference = None
+    for solver in ['lstsq'] + [s for s in SOLVERS if s != 'lstsq']:
+        times = []
+        for _ in range(repeat):
+            model = GradientDescentLinearRegression(
+                learning_rate=0.01, max_iterations=MAX_ITERATIONS.get(solver, 1000),
+                fast=True, solver=solver, random_state=0
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                model.fit(X_train, y_train, X_test, y_test)
+                times.append(time.perf_counter() - started)
+        if reference is None:
+            reference = model.weights.copy()
+        residual = model.predict(X_train) - y_train
+        results.append({
+            "solver": solver,
+            "resolved_solver": model.solver_,
+            "fit_seconds": statistics.median(times),
+            "train_mse": float(residual @ residual / len(residual)),
+            "max_weight_error": float(np.abs(model.weights - reference).max())
+        })
+
+    print(f"\n📊 {name}: {X_train.shape[0]} rows x {X_train.shape[1]} features")
+    print(f"   {'solver':<28} {'fit time':>12} {'train MSE':>12} {'max |w - w_lstsq|':>18}")
+    for result in results:
+        solver = result['solver'] if result['solver'] != 'auto' else f"auto ({result['resolved_solver']})"
+        print(f"   {solver:<28} {result['fit_seconds'] * 1000:9.2f} ms {result['train_mse']:12.4f} {result['max_weight_error']:18.2e}")
+    return {"dataset": name, "rows": int(X_train.shape[0]), "features": int(X_train.shape[1]), "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare GradientDescentLinearRegression solvers")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows in the synthetic dataset")
+    parser.add_argument("--features", type=int, default=7, help="Features in the synthetic dataset")
+    parser.add_argument("--repeat", type=int, default=3, help="Fits per solver (median time is reported)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "datasets": [
+            benchmark_dataset("Employment panel", panel_dataset(), args.repeat),
+            benchmark_dataset("Synthetic", synthetic_dataset(args.rows, args.features), args.repeat)
+        ]
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
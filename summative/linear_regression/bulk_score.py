@@ -0,0 +1,259 @@
+"""
+Offline bulk scoring of large CSV / Parquet tables with the best model
+
+Usage:
+    python bulk_score.py input.csv predictions.csv
+    python bulk_score.py panel.parquet predictions.parquet --workers 8 --keep Country,Year
+
+The model is loaded once in the parent process. Worker processes are forked
+from it so they share the model's memory copy-on-write (on platforms without
+fork each worker loads it once at start-up). The input is split into
+independent pieces - byte ranges of a CSV that end on row boundaries, or row
+groups of a Parquet file - that workers read, parse and score on their own, so parsing
+scales with the number of cores as well as prediction. Only a bounded window
+of pieces is in flight, and results are written in input order as they
+complete.
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Training feature order, used when the model file does not record it
+from pipeline import FEATURE_COLUMNS
+
+# Model shared by the worker processes (inherited on fork)
+_model_data = None
+
+
+def load_model_data(model_path):
+    """Load a best_model.pkl style dict, or wrap a bare estimator"""
+    model_data = joblib.load(model_path)
+    if not isinstance(model_data, dict):
+        model_data = {'model': model_data, 'scaler': None}
+    return model_data
+
+
+def _init_worker(model_path):
+    global _model_data
+    if _model_data is None:
+        _model_data = load_model_data(model_path)
+
+
+def read_to_row_end(f, quotes=0):
+    """
+    Read to the end of the current CSV row, given how many quote characters were already read in it
+
+    A quoted field can contain newlines. With the csv module's default
+    dialect (quotes inside a field are doubled) a newline ends the row only
+    when an even number of quote characters precede it in the row.
+    """
+    rest = f.readline()
+    quotes += rest.count(b'"')
+    while quotes % 2:
+        line = f.readline()
+        if not line:
+            break
+        rest += line
+        quotes += line.count(b'"')
+    return rest
+
+
+def split_csv(path, chunk_bytes):
+    """
+    Header row and (start, end) byte ranges of a CSV file that end on row boundaries
+
+    Every range starts a row, so the quotes counted in a chunk tell whether
+    its last byte is inside a quoted field. This reads the file once in the
+    parent, which only counts bytes; the workers do the parsing.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = read_to_row_end(f)
+        start = f.tell()
+        ranges = []
+        while start < size:
+            read_to_row_end(f, f.read(chunk_bytes).count(b'"'))
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header.decode('utf-8-sig'), ranges
+
+
+def list_pieces(input_path, chunk_bytes):
+    """Input column names and independent pieces of the input that workers can read on their own"""
+    if input_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(input_path)
+        pieces = [('parquet', input_path, group, None) for group in range(parquet_file.num_row_groups)]
+        return list(parquet_file.schema_arrow.names), pieces
+    header, ranges = split_csv(input_path, chunk_bytes)
+    columns = list(pd.read_csv(io.StringIO(header), nrows=0).columns)
+    return columns, [('csv', input_path, (start, end), columns) for start, end in ranges]
+
+
+def read_piece(piece):
+    """Read one piece of the input as a DataFrame"""
+    kind, path, location, columns = piece
+    if kind == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).read_row_group(location).to_pandas()
+    start, end = location
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(data), header=None, names=columns)
+
+
+def score_frame(frame, model_data, keep_columns):
+    """Score a DataFrame with the model; rows with missing features get NaN"""
+    model = model_data['model']
+    scaler = model_data.get('scaler')
+    feature_columns = model_data.get('feature_columns') or FEATURE_COLUMNS
+
+    # Match input columns case-insensitively (gdp_per_capita == GDP_per_capita)
+    lookup = {column.lower(): column for column in frame.columns}
+    missing = [column for column in feature_columns if column.lower() not in lookup]
+    if missing:
+        raise KeyError(f"Input is missing feature columns: {missing}")
+    X = frame[[lookup[column.lower()] for column in feature_columns]]
+    X = pd.DataFrame(X.to_numpy(dtype=float), columns=feature_columns)
+
+    complete = ~X.isna().any(axis=1).to_numpy()
+    predictions = np.full(len(X), np.nan)
+    if complete.any():
+        X_valid = X[complete]
+        if scaler is not None:
+            X_valid = scaler.transform(X_valid)
+        predictions[complete] = model.predict(X_valid)
+
+    result = frame[[lookup[column.lower()] for column in keep_columns]].reset_index(drop=True)
+    result['predicted_employment_rate'] = predictions
+    return result
+
+
+def score_piece(piece, keep_columns, as_csv):
+    """
+    Worker task: read, parse and score one piece of the input
+
+    CSV output is formatted in the worker too, so the parent only appends
+    text. Returns (row count, CSV text without header or DataFrame).
+    """
+    frame = score_frame(read_piece(piece), _model_data, keep_columns)
+    if as_csv:
+        return len(frame), frame.to_csv(header=False, index=False)
+    return len(frame), frame
+
+
+class PredictionWriter:
+    """Append scored chunks (CSV text or DataFrames) to a CSV or Parquet output file"""
+
+    def __init__(self, path, keep_columns):
+        self.path = path
+        self.as_csv = not path.endswith('.parquet')
+        self._parquet_writer = None
+        self._csv_file = None
+        if self.as_csv:
+            self._csv_file = open(path, 'w', newline='')
+            self._csv_file.write(','.join([*keep_columns, 'predicted_employment_rate']) + '\n')
+
+    def write(self, payload):
+        if self.as_csv:
+            self._csv_file.write(payload)
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(payload, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def bulk_score(input_path, output_path, model_path='best_model.pkl', workers=None,
+               chunk_bytes=32 * 1024 * 1024, keep_columns=()):
+    """
+    Score `input_path` into `output_path` and return (rows, seconds)
+
+    At most 2 * workers pieces are in flight, so memory stays bounded by
+    the chunk size rather than the input size.
+    """
+    global _model_data
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    # Load once here; forked workers inherit it instead of unpickling again
+    _model_data = load_model_data(model_path)
+    columns, pieces = list_pieces(input_path, chunk_bytes)
+    lookup = {column.lower(): column for column in columns}
+    unknown = [column for column in keep_columns if column.lower() not in lookup]
+    if unknown:
+        raise KeyError(f"Columns to keep not found in input: {unknown}")
+    keep_columns = [lookup[column.lower()] for column in keep_columns]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    writer = PredictionWriter(output_path, keep_columns)
+    rows = 0
+
+    def write(result):
+        nonlocal rows
+        count, payload = result
+        writer.write(payload)
+        rows += count
+
+    try:
+        if workers == 1:
+            for piece in pieces:
+                write(score_piece(piece, keep_columns, writer.as_csv))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(model_path,)) as pool:
+                # Keep a bounded window in flight and write results in input order
+                in_flight = deque()
+                for piece in pieces:
+                    in_flight.append(pool.submit(score_piece, piece, keep_columns, writer.as_csv))
+                    if len(in_flight) >= 2 * workers:
+                        write(in_flight.popleft().result())
+                while in_flight:
+                    write(in_flight.popleft().result())
+    finally:
+        writer.close()
+
+    return rows, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk score a CSV or Parquet table with the best model")
+    parser.add_argument('input', help="Input .csv or .parquet file")
+    parser.add_argument('output', help="Output .csv or .parquet file")
+    parser.add_argument('--model', default='best_model.pkl', help="Model file (default: best_model.pkl)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-mb', type=float, default=32, help="CSV bytes per chunk in MB (default: 32)")
+    parser.add_argument('--keep', default='', help="Comma separated input columns to copy to the output")
+    args = parser.parse_args()
+
+    keep_columns = [column.strip() for column in args.keep.split(',') if column.strip()]
+    workers = args.workers or os.cpu_count() or 1
+
+    print(f"🚀 Scoring {args.input} with {args.model} on {workers} worker(s)...")
+    rows, seconds = bulk_score(args.input, args.output, args.model, workers,
+                               int(args.chunk_mb * 1024 * 1024), keep_columns)
+    print(f"✅ Predictions for {rows:,} rows written to '{args.output}'")
+    print(f"⏱️  {seconds:.2f} s ({rows / seconds if seconds else 0:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
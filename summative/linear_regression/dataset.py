@@ -0,0 +1,150 @@
+"""
+Typed loader for the African employment panel with a memory-mapped cache
+
+    from dataset import load_employment_data
+    df = load_employment_data()                       # parses the CSV once, then maps the cache
+    df = load_employment_data(columns=FEATURE_COLUMNS + [TARGET_COLUMN])
+
+The CSV is parsed with the compact SCHEMA below (categoricals for the
+country columns, int16 years, float32 indicators, int32 population so
+head counts stay exact) and validated. The parsed table is then written
+next to the CSV as one uncompressed .npy file per column, with the
+category labels and the CSV's size and mtime in meta.json. Later loads
+memory-map those files instead of parsing text, and the cache is rebuilt
+whenever the CSV changes.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = 'comprehensive_african_employment_data.csv'
+
+# Bump when SCHEMA or the cache layout changes so old caches are rebuilt
+CACHE_VERSION = 1
+
+SCHEMA = {
+    'Country': 'category',
+    'ISO_Code': 'category',
+    'Year': 'int16',
+    'GDP_per_capita': 'float32',
+    'Life_expectancy': 'float32',
+    'Population': 'int32',
+    'Urban_population_percent': 'float32',
+    'Employment_rate': 'float32',
+    'School_enrollment_primary': 'float32',
+    'School_enrollment_secondary': 'float32',
+    'Literacy_rate': 'float32'
+}
+
+# Inclusive valid range of each numeric column. Enrollment is a gross ratio
+# and the panel's literacy rates also run slightly past 100, hence 150.
+VALID_RANGES = {
+    'Year': (1900, 2100),
+    'GDP_per_capita': (0, None),
+    'Life_expectancy': (0, 120),
+    'Population': (0, None),
+    'Urban_population_percent': (0, 100),
+    'Employment_rate': (0, 100),
+    'School_enrollment_primary': (0, 150),
+    'School_enrollment_secondary': (0, 150),
+    'Literacy_rate': (0, 150)
+}
+
+
+def cache_dir_for(path):
+    """Cache directory of a CSV: data.csv -> data_cache/"""
+    return os.path.splitext(path)[0] + '_cache'
+
+
+def read_csv(path):
+    """Parse the CSV with the compact SCHEMA dtypes"""
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [column for column in SCHEMA if column not in header]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {missing}")
+    return pd.read_csv(path, usecols=list(SCHEMA), dtype=SCHEMA)[list(SCHEMA)]
+
+
+def validate(df):
+    """Raise ValueError listing missing values and out-of-range entries"""
+    problems = []
+    for column, count in df.isna().sum().items():
+        if count:
+            problems.append(f"{column}: {count} missing value(s)")
+    for column, (low, high) in VALID_RANGES.items():
+        values = df[column]
+        if low is not None and (values < low).any():
+            problems.append(f"{column}: {(values < low).sum()} value(s) below {low}")
+        if high is not None and (values > high).any():
+            problems.append(f"{column}: {(values > high).sum()} value(s) above {high}")
+    if problems:
+        raise ValueError("Invalid employment dataset:\n  " + "\n  ".join(problems))
+    return df
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {'version': CACHE_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_cache(df, cache_dir, stamp):
+    """Write one .npy file per column (category codes for categoricals) plus meta.json"""
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    categories = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories[column] = values.cat.categories.tolist()
+            values = values.cat.codes
+        np.save(os.path.join(cache_dir, f"{column}.npy"), values.to_numpy())
+    # meta.json goes last: a cache without it is never read
+    with open(meta_path, 'w') as f:
+        json.dump({'source': stamp, 'columns': list(df.columns), 'categories': categories}, f)
+
+
+def read_cache(cache_dir, stamp, columns=None):
+    """Memory-map the cached columns, or return None if the cache is missing or stale"""
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta['source'] != stamp:
+        return None
+    data = {}
+    for column in columns or meta['columns']:
+        values = np.load(os.path.join(cache_dir, f"{column}.npy"), mmap_mode='r')
+        if column in meta['categories']:
+            values = pd.Categorical.from_codes(values, meta['categories'][column])
+        # Wrapping each column in a Series keeps pandas from consolidating
+        # (and so copying) the mapped arrays into one block
+        data[column] = pd.Series(values, name=column, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def load_employment_data(path=DATA_PATH, columns=None, use_cache=True):
+    """
+    Typed, validated employment panel as a DataFrame
+
+    columns: subset of SCHEMA columns to return (default: all)
+    use_cache: read and refresh the memory-mapped column cache next to the CSV
+    """
+    unknown = [column for column in columns or () if column not in SCHEMA]
+    if unknown:
+        raise KeyError(f"Unknown dataset columns: {unknown}")
+    cache_dir = cache_dir_for(path)
+    stamp = _source_stamp(path)
+    if use_cache:
+        df = read_cache(cache_dir, stamp, columns)
+        if df is not None:
+            return df
+
+    df = validate(read_csv(path))
+    if use_cache:
+        write_cache(df, cache_dir, stamp)
+    return df[columns] if columns else df
@@ -1,36 +1,113 @@
+import copy
+
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 
+SOLVERS = ('auto', 'gd', 'sgd', 'normal', 'qr', 'lstsq', 'conjugate_gradient')
+# Solvers that compute the least squares solution directly instead of by gradient steps
+EXACT_SOLVERS = ('normal', 'qr', 'lstsq', 'conjugate_gradient')
+# solver='auto' solves directly up to this many features ...
+AUTO_DIRECT_MAX_FEATURES = 2000
+# ... and switches to SGD above this many matrix entries (rows x features)
+AUTO_SGD_MIN_ENTRIES = 50_000_000
+# Batch size for solver='sgd' when batch_size is not given
+DEFAULT_SGD_BATCH_SIZE = 256
+
 class GradientDescentLinearRegression:
-    def __init__(self, learning_rate=0.01, max_iterations=1000, tolerance=1e-6):
+    def __init__(self, learning_rate=0.01, max_iterations=1000, tolerance=1e-6,
+                 fast=False, eval_interval=100, batch_size=None, shuffle=True,
+                 lr_schedule='constant', lr_decay=0.5, lr_step_size=1000,
+                 optimizer='gd', momentum=0.9, beta2=0.999, epsilon=1e-8,
+                 random_state=None, solver='gd'):
+        """
+        fast=True reuses the gradient's residual for the training loss, only
+        evaluates the test loss every `eval_interval` iterations and keeps the
+        loss history in preallocated NumPy arrays (see `_fit_fast`).
+        
+        batch_size switches to mini-batch / stochastic gradient descent: each
+        of the `max_iterations` epochs takes one update per batch of rows
+        (shuffled when `shuffle=True`). The same updates drive `partial_fit`.
+        
+        lr_schedule: 'constant', 'step' (multiply by lr_decay every
+        lr_step_size updates) or 'invtime' (learning_rate / (1 + lr_decay * t)).
+        optimizer: 'gd' (plain updates), 'momentum' or 'adam' (with momentum
+        as beta1, beta2 and epsilon).
+        
+        solver: 'gd' (full-batch gradient descent), 'sgd' (mini-batches of
+        batch_size, 256 by default), 'normal' (normal equations), 'qr',
+        'lstsq' (SVD), 'conjugate_gradient' (CGLS, no X.T @ X is formed) or
+        'auto', which solves directly for up to AUTO_DIRECT_MAX_FEATURES
+        features and uses SGD on huge data or conjugate gradient on wide data.
+        'gd' stays the default: the direct solvers leave a single-point loss
+        history, so the loss curves (the point of this class) need it.
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}' (expected one of {SOLVERS})")
+        if lr_schedule not in ('constant', 'step', 'invtime'):
+            raise ValueError(f"Unknown lr_schedule '{lr_schedule}' (expected 'constant', 'step' or 'invtime')")
+        if optimizer not in ('gd', 'momentum', 'adam'):
+            raise ValueError(f"Unknown optimizer '{optimizer}' (expected 'gd', 'momentum' or 'adam')")
         self.learning_rate = learning_rate
         self.max_iterations = max_iterations
         self.tolerance = tolerance
+        self.fast = fast
+        self.eval_interval = max(1, int(eval_interval))
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.lr_schedule = lr_schedule
+        self.lr_decay = lr_decay
+        self.lr_step_size = lr_step_size
+        self.optimizer = optimizer
+        self.momentum = momentum
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.random_state = random_state
+        self.solver = solver
+        # Solver actually used by the last fit (resolves 'auto')
+        self.solver_ = None
+        # Number of parameter updates so far (drives schedules and Adam bias correction)
+        self.n_updates = 0
         self.weights = None
         self.bias = None
         self.train_losses = []
         self.test_losses = []
+        # Iteration of each test loss (every iteration unless fast=True)
+        self.test_loss_iterations = []
         
     def fit(self, X_train, y_train, X_test, y_test):
         """
         Train the model using gradient descent
         """
         n_samples, n_features = X_train.shape
+        self.solver_ = self._select_solver(n_samples, n_features)
         
         # Initialize parameters
         self.weights = np.zeros(n_features)
         self.bias = 0
         
+        if self.solver_ in EXACT_SOLVERS:
+            self._fit_exact(X_train, y_train, X_test, y_test)
+            return
+        
         print(f"🚀 Starting Gradient Descent Training...")
         print(f"📊 Training samples: {n_samples}")
         print(f"🔧 Features: {n_features}")
         print(f"📈 Learning rate: {self.learning_rate}")
         print(f"🔄 Max iterations: {self.max_iterations}")
         
+        if self.solver_ == 'sgd' or self.batch_size is not None or \
+                self.optimizer != 'gd' or self.lr_schedule != 'constant':
+            self._fit_minibatch(X_train, y_train, X_test, y_test)
+            return
+        if self.fast:
+            self._fit_fast(X_train, y_train, X_test, y_test)
+            return
+        
+        self.train_losses = []
+        self.test_losses = []
         for iteration in range(self.max_iterations):
             # Forward pass
             y_pred_train = self._predict(X_train)
@@ -62,7 +139,347 @@ class GradientDescentLinearRegression:
                 print(f"✅ Early stopping at iteration {iteration}")
                 break
         
+        self.test_loss_iterations = list(range(len(self.test_losses)))
         print(f"✅ Training completed in {len(self.train_losses)} iterations!")
+    
+    def _fit_fast(self, X_train, y_train, X_test, y_test):
+        """
+        Same updates as the standard loop without per-iteration overhead
+
+        The residual X @ w + b - y is computed once into a preallocated
+        buffer and serves both the gradient and the training loss
+        (residual @ residual / n), so sklearn metrics and their input
+        validation are never called. R² is derived from the losses.
+        """
+        X_train = np.ascontiguousarray(X_train, dtype=np.float64)
+        X_test = np.ascontiguousarray(X_test, dtype=np.float64)
+        y_train = np.asarray(y_train, dtype=np.float64)
+        y_test = np.asarray(y_test, dtype=np.float64)
+        n_samples = X_train.shape[0]
+        X_train_T = np.ascontiguousarray(X_train.T)
+        train_var = y_train.var()
+        test_var = y_test.var()
+        
+        residual = np.empty(n_samples)
+        test_residual = np.empty(X_test.shape[0])
+        dw = np.empty(X_train.shape[1])
+        n_evals = self.max_iterations // self.eval_interval + 2
+        train_losses = np.empty(self.max_iterations)
+        test_losses = np.empty(n_evals)
+        test_iterations = np.empty(n_evals, dtype=np.int64)
+        
+        evals = 0
+        for iteration in range(self.max_iterations):
+            # Residual of the current parameters, reused for loss and gradients
+            np.dot(X_train, self.weights, out=residual)
+            residual -= y_train
+            residual += self.bias
+            train_losses[iteration] = residual @ residual / n_samples
+            converged = iteration > 0 and abs(train_losses[iteration] - train_losses[iteration - 1]) < self.tolerance
+            
+            # Test loss only every eval_interval iterations (and on the last one)
+            if iteration % self.eval_interval == 0 or converged or iteration == self.max_iterations - 1:
+                np.dot(X_test, self.weights, out=test_residual)
+                test_residual -= y_test
+                test_residual += self.bias
+                test_losses[evals] = test_residual @ test_residual / len(test_residual)
+                test_iterations[evals] = iteration
+                evals += 1
+            
+            # Calculate gradients
+            np.dot(X_train_T, residual, out=dw)
+            dw *= 2 / n_samples
+            db = (2 / n_samples) * residual.sum()
+            
+            # Update parameters
+            self.weights -= self.learning_rate * dw
+            self.bias -= self.learning_rate * db
+            
+            # Print progress every 100 iterations (test loss from the latest evaluation)
+            if iteration % 100 == 0:
+                train_loss, test_loss = train_losses[iteration], test_losses[evals - 1]
+                print(f"Iteration {iteration}: Train Loss={train_loss:.4f}, Test Loss={test_loss:.4f}, Train R²={1 - train_loss / train_var:.4f}, Test R²={1 - test_loss / test_var:.4f}")
+            
+            # Early stopping
+            if converged:
+                print(f"✅ Early stopping at iteration {iteration}")
+                break
+        
+        self.train_losses = train_losses[:iteration + 1]
+        self.test_losses = test_losses[:evals]
+        self.test_loss_iterations = test_iterations[:evals]
+        print(f"✅ Training completed in {len(self.train_losses)} iterations!")
+    
+    def _select_solver(self, n_samples, n_features):
+        """Resolve solver='auto' from the shape of the training data"""
+        if self.solver != 'auto':
+            return self.solver
+        if n_samples * n_features > AUTO_SGD_MIN_ENTRIES:
+            return 'sgd'
+        if n_features <= AUTO_DIRECT_MAX_FEATURES:
+            return 'normal'
+        return 'conjugate_gradient'
+    
+    def _fit_exact(self, X_train, y_train, X_test, y_test):
+        """
+        Solve the least squares problem directly
+        
+        Features and target are centered so the intercept drops out
+        (bias = mean(y) - mean(X) @ weights) and the system is better
+        conditioned. 'normal' falls back to lstsq if X.T @ X is singular,
+        'qr' if R has a (near) zero diagonal entry, i.e. X is rank deficient.
+        Loss histories hold the single final train/test loss.
+        """
+        X_train = np.asarray(X_train, dtype=np.float64)
+        y_train = np.asarray(y_train, dtype=np.float64)
+        x_mean = X_train.mean(axis=0)
+        y_mean = y_train.mean()
+        X_centered = X_train - x_mean
+        y_centered = y_train - y_mean
+        
+        print(f"🚀 Fitting with the {self.solver_} solver ({X_train.shape[0]} samples, {X_train.shape[1]} features)...")
+        if self.solver_ == 'normal':
+            try:
+                self.weights = np.linalg.solve(X_centered.T @ X_centered, X_centered.T @ y_centered)
+            except np.linalg.LinAlgError:
+                print("⚠️  X.T @ X is singular, falling back to lstsq")
+                self.weights = np.linalg.lstsq(X_centered, y_centered, rcond=None)[0]
+        elif self.solver_ == 'qr':
+            Q, R = np.linalg.qr(X_centered)
+            diagonal = np.abs(np.diag(R))
+            # Same cutoff as lstsq's default rcond
+            if diagonal.size and diagonal.min() > max(X_centered.shape) * np.finfo(float).eps * diagonal.max():
+                self.weights = np.linalg.solve(R, Q.T @ y_centered)
+            else:
+                print("⚠️  X is rank deficient, falling back to lstsq")
+                self.weights = np.linalg.lstsq(X_centered, y_centered, rcond=None)[0]
+        elif self.solver_ == 'lstsq':
+            self.weights = np.linalg.lstsq(X_centered, y_centered, rcond=None)[0]
+        else:
+            self.weights = self._conjugate_gradient(X_centered, y_centered)
+        self.bias = float(y_mean - x_mean @ self.weights)
+        
+        train_residual = self._predict(X_train) - y_train
+        test_residual = self._predict(np.asarray(X_test, dtype=np.float64)) - np.asarray(y_test, dtype=np.float64)
+        self.train_losses = np.array([train_residual @ train_residual / len(train_residual)])
+        self.test_losses = np.array([test_residual @ test_residual / len(test_residual)])
+        self.test_loss_iterations = np.array([0])
+        print(f"✅ Solved: Train Loss={self.train_losses[0]:.4f}, Test Loss={self.test_losses[0]:.4f}")
+    
+    def _conjugate_gradient(self, X, y):
+        """
+        Conjugate gradient on the normal equations (CGLS)
+        
+        Only needs X @ p and X.T @ r products, so X.T @ X is never formed;
+        runs for at most max_iterations steps or until the gradient norm
+        falls below tolerance relative to X.T @ y.
+        """
+        weights = np.zeros(X.shape[1])
+        residual = y.copy()
+        gradient = X.T @ residual
+        direction = gradient.copy()
+        gamma = gradient @ gradient
+        stop = (self.tolerance * np.sqrt(gamma)) ** 2
+        
+        iterations = 0
+        while iterations < self.max_iterations and gamma > stop:
+            iterations += 1
+            projected = X @ direction
+            step = gamma / (projected @ projected)
+            weights += step * direction
+            residual -= step * projected
+            gradient = X.T @ residual
+            gamma_next = gradient @ gradient
+            direction *= gamma_next / gamma
+            direction += gradient
+            gamma = gamma_next
+        print(f"🔄 Conjugate gradient finished after {iterations} iterations")
+        return weights
+    
+    def _reset_optimizer(self, n_features):
+        """Zero the parameters and the optimizer state"""
+        self.weights = np.zeros(n_features)
+        self.bias = 0.0
+        self.n_updates = 0
+        self._init_optimizer_state(n_features)
+    
+    def _init_optimizer_state(self, n_features):
+        # First and second moment estimates for (weights, bias)
+        self._velocity = np.zeros(n_features + 1)
+        self._second_moment = np.zeros(n_features + 1)
+        # Gradient and step buffers reused by every _batch_update
+        self._gradient = np.empty(n_features + 1)
+        self._step = np.empty(n_features + 1)
+    
+    def _current_learning_rate(self):
+        if self.lr_schedule == 'step':
+            return self.learning_rate * self.lr_decay ** (self.n_updates // self.lr_step_size)
+        if self.lr_schedule == 'invtime':
+            return self.learning_rate / (1 + self.lr_decay * self.n_updates)
+        return self.learning_rate
+    
+    def _batch_update(self, X_batch, y_batch, residual):
+        """
+        One optimizer step on a batch; returns the batch MSE before the step
+        
+        `residual` is a buffer of at least len(X_batch) rows, reused across
+        batches; the gradient and step go to buffers made with the optimizer
+        state, so an update allocates no arrays.
+        """
+        n = len(X_batch)
+        residual = residual[:n]
+        np.dot(X_batch, self.weights, out=residual)
+        residual -= y_batch
+        residual += self.bias
+        loss = residual @ residual / n
+        
+        gradient, step = self._gradient, self._step
+        np.dot(residual, X_batch, out=gradient[:-1])
+        gradient[-1] = residual.sum()
+        gradient *= 2 / n
+        
+        learning_rate = self._current_learning_rate()
+        self.n_updates += 1
+        if self.optimizer == 'momentum':
+            self._velocity *= self.momentum
+            self._velocity += gradient
+            np.multiply(self._velocity, learning_rate, out=step)
+        elif self.optimizer == 'adam':
+            beta1, beta2 = self.momentum, self.beta2
+            self._velocity *= beta1
+            np.multiply(gradient, 1 - beta1, out=step)
+            self._velocity += step
+            self._second_moment *= beta2
+            np.multiply(gradient, gradient, out=step)
+            step *= 1 - beta2
+            self._second_moment += step
+            # step = learning_rate * m_hat / (sqrt(v_hat) + epsilon), built in place
+            np.divide(self._second_moment, 1 - beta2 ** self.n_updates, out=step)
+            np.sqrt(step, out=step)
+            step += self.epsilon
+            np.divide(self._velocity, step, out=step)
+            step *= learning_rate / (1 - beta1 ** self.n_updates)
+        else:
+            np.multiply(gradient, learning_rate, out=step)
+        
+        self.weights -= step[:-1]
+        self.bias -= step[-1]
+        return loss
+    
+    def _fit_minibatch(self, X_train, y_train, X_test, y_test):
+        """
+        Mini-batch / stochastic gradient descent over `max_iterations` epochs
+        
+        The training loss of an epoch is the mean of its batch losses (taken
+        before each step, so it costs nothing extra); the test loss is
+        evaluated every `eval_interval` epochs and on the last one.
+        """
+        X_train = np.ascontiguousarray(X_train, dtype=np.float64)
+        X_test = np.ascontiguousarray(X_test, dtype=np.float64)
+        y_train = np.asarray(y_train, dtype=np.float64)
+        y_test = np.asarray(y_test, dtype=np.float64)
+        n_samples, n_features = X_train.shape
+        batch_size = self.batch_size or (DEFAULT_SGD_BATCH_SIZE if self.solver_ == 'sgd' else n_samples)
+        batch_size = min(batch_size, n_samples)
+        # A new fit restarts the shuffling sequence; partial_fit continues it
+        self._rng = np.random.default_rng(self.random_state)
+        self._reset_optimizer(n_features)
+        
+        print(f"📦 Batch size: {batch_size} ({self.optimizer}, {self.lr_schedule} learning rate)")
+        
+        residual = np.empty(batch_size)
+        # Shuffled batches are gathered into these instead of new arrays
+        X_batch_buffer = np.empty((batch_size, n_features))
+        y_batch_buffer = np.empty(batch_size)
+        test_residual = np.empty(len(X_test))
+        n_evals = self.max_iterations // self.eval_interval + 2
+        train_losses = np.empty(self.max_iterations)
+        test_losses = np.empty(n_evals)
+        test_iterations = np.empty(n_evals, dtype=np.int64)
+        
+        evals = 0
+        for epoch in range(self.max_iterations):
+            order = self._rng.permutation(n_samples) if self.shuffle and batch_size < n_samples else None
+            epoch_loss = 0.0
+            for start in range(0, n_samples, batch_size):
+                if order is None:
+                    X_batch = X_train[start:start + batch_size]
+                    y_batch = y_train[start:start + batch_size]
+                else:
+                    rows = order[start:start + batch_size]
+                    X_batch = np.take(X_train, rows, axis=0, out=X_batch_buffer[:len(rows)])
+                    y_batch = np.take(y_train, rows, out=y_batch_buffer[:len(rows)])
+                epoch_loss += self._batch_update(X_batch, y_batch, residual) * len(X_batch)
+            train_losses[epoch] = epoch_loss / n_samples
+            converged = epoch > 0 and abs(train_losses[epoch] - train_losses[epoch - 1]) < self.tolerance
+            
+            if epoch % self.eval_interval == 0 or converged or epoch == self.max_iterations - 1:
+                np.dot(X_test, self.weights, out=test_residual)
+                test_residual -= y_test
+                test_residual += self.bias
+                test_losses[evals] = test_residual @ test_residual / len(test_residual)
+                test_iterations[evals] = epoch
+                evals += 1
+            
+            if epoch % 100 == 0:
+                print(f"Epoch {epoch}: Train Loss={train_losses[epoch]:.4f}, Test Loss={test_losses[evals - 1]:.4f}, Learning rate={self._current_learning_rate():.6f}")
+            
+            if converged:
+                print(f"✅ Early stopping at epoch {epoch}")
+                break
+        
+        self.train_losses = train_losses[:epoch + 1]
+        self.test_losses = test_losses[:evals]
+        self.test_loss_iterations = test_iterations[:evals]
+        print(f"✅ Training completed in {len(self.train_losses)} epochs ({self.n_updates} updates)!")
+    
+    def partial_fit(self, X, y=None):
+        """
+        Continue training on more data without holding it all in memory
+        
+        Accepts one (X, y) chunk, or an iterable of (X_chunk, y_chunk) pairs
+        as X (e.g. `iter_csv_chunks(...)`). Each chunk is split into
+        batch_size rows per update (the whole chunk when batch_size is None)
+        and then released, so memory stays flat however much data streams
+        through. The mean loss of each chunk is appended to train_losses.
+        Parameters and optimizer state are created on the first call, and
+        chunks are shuffled by one random generator kept across calls (so
+        successive calls do not repeat the same permutations).
+        """
+        chunks = [(X, y)] if y is not None else X
+        if getattr(self, '_rng', None) is None:
+            self._rng = np.random.default_rng(self.random_state)
+        if not isinstance(self.train_losses, list):
+            self.train_losses = list(self.train_losses)
+        residual = np.empty(0)
+        
+        for X_chunk, y_chunk in chunks:
+            X_chunk = np.ascontiguousarray(X_chunk, dtype=np.float64)
+            y_chunk = np.asarray(y_chunk, dtype=np.float64)
+            n_samples = len(X_chunk)
+            if n_samples == 0:
+                continue
+            if self.weights is None:
+                self._reset_optimizer(X_chunk.shape[1])
+            elif getattr(self, '_gradient', None) is None:
+                # Continue from weights learned by fit()
+                self.weights = np.asarray(self.weights, dtype=np.float64)
+                self.bias = float(self.bias)
+                self._init_optimizer_state(len(self.weights))
+            batch_size = min(self.batch_size or n_samples, n_samples)
+            if len(residual) < batch_size:
+                residual = np.empty(batch_size)
+            if self.shuffle and batch_size < n_samples:
+                order = self._rng.permutation(n_samples)
+                X_chunk, y_chunk = X_chunk[order], y_chunk[order]
+            
+            chunk_loss = 0.0
+            for start in range(0, n_samples, batch_size):
+                X_batch = X_chunk[start:start + batch_size]
+                y_batch = y_chunk[start:start + batch_size]
+                chunk_loss += self._batch_update(X_batch, y_batch, residual) * len(X_batch)
+            self.train_losses.append(chunk_loss / n_samples)
+        return self
         
     def _predict(self, X):
         """Make predictions"""
@@ -72,14 +489,15 @@ class GradientDescentLinearRegression:
         """Public predict method"""
         return self._predict(X)
     
-    def plot_loss_curves(self):
-        """Plot training and test loss curves"""
+    def plot_loss_curves(self, path=None):
+        """Plot training and test loss curves (also saved to `path` when given)"""
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(12, 5))
         
         # Training and test loss
         plt.subplot(1, 2, 1)
         plt.plot(self.train_losses, label='Training Loss', color='blue', linewidth=2)
-        plt.plot(self.test_losses, label='Test Loss', color='red', linewidth=2)
+        plt.plot(self.test_loss_iterations, self.test_losses, label='Test Loss', color='red', linewidth=2)
         plt.xlabel('Iteration')
         plt.ylabel('Mean Squared Error')
         plt.title('Gradient Descent: Loss Curves')
@@ -88,22 +506,25 @@ class GradientDescentLinearRegression:
         
         # Loss difference
         plt.subplot(1, 2, 2)
-        loss_diff = np.array(self.train_losses) - np.array(self.test_losses)
-        plt.plot(loss_diff, color='green', linewidth=2)
+        loss_diff = np.asarray(self.train_losses)[self.test_loss_iterations] - np.asarray(self.test_losses)
+        plt.plot(self.test_loss_iterations, loss_diff, color='green', linewidth=2)
         plt.xlabel('Iteration')
         plt.ylabel('Train Loss - Test Loss')
         plt.title('Loss Difference (Train - Test)')
         plt.grid(True, alpha=0.3)
         
         plt.tight_layout()
+        if path:
+            plt.savefig(path, dpi=150, bbox_inches='tight')
         plt.show()
         
         print(f"📊 Final Training Loss: {self.train_losses[-1]:.4f}")
         print(f"📊 Final Test Loss: {self.test_losses[-1]:.4f}")
         print(f"📊 Loss Difference: {loss_diff[-1]:.4f}")
     
-    def plot_predictions(self, X_train, y_train, X_test, y_test):
-        """Plot actual vs predicted values"""
+    def plot_predictions(self, X_train, y_train, X_test, y_test, path=None):
+        """Plot actual vs predicted values (also saved to `path` when given) and return the metrics"""
+        import matplotlib.pyplot as plt
         y_pred_train = self.predict(X_train)
         y_pred_test = self.predict(X_test)
         
@@ -138,9 +559,18 @@ class GradientDescentLinearRegression:
         plt.grid(True, alpha=0.3)
         
         plt.tight_layout()
+        if path:
+            plt.savefig(path, dpi=150, bbox_inches='tight')
         plt.show()
         
-        # Calculate metrics
+        return self.evaluate(X_train, y_train, X_test, y_test, y_pred_train, y_pred_test)
+    
+    def evaluate(self, X_train, y_train, X_test, y_test, y_pred_train=None, y_pred_test=None):
+        """Print and return training and test R² and RMSE"""
+        if y_pred_train is None:
+            y_pred_train = self.predict(X_train)
+        if y_pred_test is None:
+            y_pred_test = self.predict(X_test)
         train_r2 = r2_score(y_train, y_pred_train)
         test_r2 = r2_score(y_test, y_pred_test)
         train_rmse = np.sqrt(mean_squared_error(y_train, y_pred_train))
@@ -159,48 +589,91 @@ class GradientDescentLinearRegression:
             'test_rmse': test_rmse
         }
 
-def train_gradient_descent_model():
-    """Main function to train gradient descent model"""
-    # Load data
-    df = pd.read_csv('comprehensive_african_employment_data.csv')
+def iter_csv_chunks(path, feature_columns, target_column, chunksize=100000, scaler=None):
+    """
+    Yield (X, y) NumPy chunks of a CSV file read `chunksize` rows at a time
     
-    # Select features
-    feature_columns = ['GDP_per_capita', 'Life_expectancy', 'Population', 
-                      'Urban_population_percent', 'School_enrollment_primary', 
-                      'School_enrollment_secondary', 'Literacy_rate']
-    
-    X = df[feature_columns]
-    y = df['Employment_rate']
+    Rows with missing values are dropped. If a fitted scaler is given, each
+    chunk is scaled with it (see `fit_scaler_on_chunks`).
+    """
+    for chunk in pd.read_csv(path, usecols=feature_columns + [target_column], chunksize=chunksize):
+        chunk = chunk.dropna()
+        X = chunk[feature_columns]
+        if scaler is not None:
+            X = scaler.transform(X)
+        yield np.asarray(X, dtype=np.float64), chunk[target_column].to_numpy(dtype=np.float64)
+
+def fit_scaler_on_chunks(path, feature_columns, target_column, chunksize=100000):
+    """Fit a StandardScaler with one streaming pass over a CSV file"""
+    scaler = StandardScaler()
+    for chunk in pd.read_csv(path, usecols=feature_columns + [target_column], chunksize=chunksize):
+        scaler.partial_fit(chunk.dropna()[feature_columns])
+    return scaler
+
+def fit_gradient_descent(estimator, split, scaled):
+    """Fit stage: a fitted copy of an unfitted GradientDescentLinearRegression"""
+    _, _, y_train, y_test = split
+    _, X_train_scaled, X_test_scaled = scaled
+    model = copy.deepcopy(estimator)
+    model.fit(X_train_scaled, y_train, X_test_scaled, y_test)
+    return model
+
+def evaluate_gradient_descent(model, split, scaled):
+    """Evaluate stage: train and test metrics"""
+    _, _, y_train, y_test = split
+    _, X_train_scaled, X_test_scaled = scaled
+    return model.evaluate(X_train_scaled, y_train, X_test_scaled, y_test)
+
+# Written by the plot stage, which reruns whenever one of them is missing
+PLOT_FILES = ['gradient_descent_loss_curves.png', 'gradient_descent_predictions.png']
+
+def plot_gradient_descent(model, split, scaled):
+    """Export stage: loss curves and prediction plots (kept out of the cached stages, which skip their body)"""
+    _, _, y_train, y_test = split
+    _, X_train_scaled, X_test_scaled = scaled
+    loss_curves_path, predictions_path = PLOT_FILES
+    model.plot_loss_curves(loss_curves_path)
+    model.plot_predictions(X_train_scaled, y_train, X_test_scaled, y_test, predictions_path)
+
+def export_gradient_descent(model, scaled, metrics):
+    """Export stage: write gradient_descent_model.pkl"""
+    from pipeline import FEATURE_COLUMNS
+    model_data = {
+        'model': model,
+        'scaler': scaled[0],
+        'feature_columns': FEATURE_COLUMNS,
+        'metrics': metrics
+    }
+    joblib.dump(model_data, 'gradient_descent_model.pkl')
+
+def train_gradient_descent_model():
+    """
+    Main function to train gradient descent model
     
-    # Split data
-    from sklearn.model_selection import train_test_split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    Runs through the cached training pipeline, so stages whose inputs did
+    not change (data, split, scaler, model settings) are reused.
+    """
+    from pipeline import Pipeline, prepare_data
     
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    pipeline = Pipeline()
+    _, split, scaled = prepare_data(pipeline)
     
     # Train gradient descent model
-    gd_model = GradientDescentLinearRegression(learning_rate=0.01, max_iterations=1000)
-    gd_model.fit(X_train_scaled, y_train, X_test_scaled, y_test)
+    estimator = GradientDescentLinearRegression(learning_rate=0.01, max_iterations=1000, fast=True)
+    gd_model = pipeline.run('fit', fit_gradient_descent, estimator=estimator, split=split, scaled=scaled)
+    
+    metrics = pipeline.run('evaluate', evaluate_gradient_descent, model=gd_model, split=split, scaled=scaled)
     
     # Plot results
-    gd_model.plot_loss_curves()
-    metrics = gd_model.plot_predictions(X_train_scaled, y_train, X_test_scaled, y_test)
+    pipeline.export('plot_gradient_descent', plot_gradient_descent, PLOT_FILES,
+                    model=gd_model, split=split, scaled=scaled)
     
     # Save model and scaler
-    model_data = {
-        'model': gd_model,
-        'scaler': scaler,
-        'feature_columns': feature_columns,
-        'metrics': metrics
-    }
-    
-    joblib.dump(model_data, 'gradient_descent_model.pkl')
+    pipeline.export('export_gradient_descent', export_gradient_descent, ['gradient_descent_model.pkl'],
+                    model=gd_model, scaled=scaled, metrics=metrics)
     print("✅ Gradient descent model saved as 'gradient_descent_model.pkl'")
     
-    return gd_model, scaler, metrics
+    return gd_model.value, scaled.value[0], metrics.value
 
 if __name__ == "__main__":
-    train_gradient_descent_model() 
\ No newline at end of file
+    train_gradient_descent_model()
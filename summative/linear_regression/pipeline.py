@@ -0,0 +1,272 @@
+"""
+Incremental training pipeline with content-hashed stage caching
+
+The training scripts run the same stages - load, split, scale, fit each
+model, evaluate, export - through a Pipeline:
+
+    pipeline = Pipeline()
+    data = pipeline.run('load', load_dataset, source=pipeline.source(DATA_PATH),
+                        feature_columns=FEATURE_COLUMNS, target_column=TARGET_COLUMN)
+    split = pipeline.run('split', split_dataset, data=data, test_size=0.2, random_state=42)
+    scaled = pipeline.run('scale', scale_split, split=split)
+
+A stage's key hashes its name, the source of its function, the digests of
+its input artifacts and its other parameters. Outputs are pickled under
+`cache_dir/<stage>/<key>.pkl` with their content digest next to them in
+`<key>.json`, and downstream stages are keyed on that digest. A stage is
+recomputed only when its key is new, and a stage that recomputes to the
+same content leaves everything after it cached. Artifact values are loaded
+on first use, so a run where nothing changed only reads the small digest
+files. Export stages write files outside the cache and are skipped while
+their key and output files are unchanged.
+"""
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+import time
+from collections.abc import Mapping
+
+import joblib
+
+CACHE_DIR = 'pipeline_cache'
+
+DATA_PATH = 'comprehensive_african_employment_data.csv'
+FEATURE_COLUMNS = ['GDP_per_capita', 'Life_expectancy', 'Population',
+                   'Urban_population_percent', 'School_enrollment_primary',
+                   'School_enrollment_secondary', 'Literacy_rate']
+TARGET_COLUMN = 'Employment_rate'
+
+_MISSING = object()
+
+
+class Artifact:
+    """Output of a stage: its content digest and its value, loaded on first use"""
+
+    def __init__(self, digest, path=None, value=_MISSING, loader=None):
+        self.digest = digest
+        self.path = path
+        self._value = value
+        self._loader = loader
+
+    @property
+    def value(self):
+        if self._value is _MISSING:
+            self._value = self._loader() if self._loader is not None else joblib.load(self.path)
+        return self._value
+
+    def derive(self, func):
+        """Artifact for func(value), also computed on first use (same digest: it is not a stage output)"""
+        return Artifact(self.digest, loader=lambda: func(self.value))
+
+
+class LazyDict(Mapping):
+    """Read-only dict whose artifact values are loaded when they are first read"""
+
+    def __init__(self, items):
+        self._items = dict(items)
+
+    def __getitem__(self, key):
+        item = self._items[key]
+        return item.value if isinstance(item, Artifact) else item
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"LazyDict({list(self._items)})"
+
+
+def code_digest(obj):
+    """Digest of a function's or class's source and package version, so editing a stage invalidates it"""
+    package = sys.modules.get((getattr(obj, '__module__', None) or '').split('.')[0])
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        source = f"{obj.__module__}.{obj.__qualname__}"
+    source += f"@{getattr(package, '__version__', '')}"
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def describe(value):
+    """JSON-able description of a stage parameter for its cache key"""
+    if isinstance(value, Artifact):
+        return {'artifact': value.digest}
+    if isinstance(value, dict):
+        return {str(key): describe(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [describe(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, 'get_params'):
+        # Worker counts do not change a fitted model
+        params = {key: item for key, item in value.get_params(deep=False).items()
+                  if key not in ('n_jobs', 'verbose')}
+    elif hasattr(value, '__dict__') and not inspect.isroutine(value):
+        params = vars(value)
+    else:
+        return repr(value)
+    # The module is part of the key: a class pickled from __main__ only unpickles there
+    return {'class': f"{type(value).__module__}.{type(value).__qualname__}", 'code': code_digest(type(value)),
+            'params': {key: describe(item) for key, item in sorted(params.items())}}
+
+
+def resolve(value):
+    """Replace artifacts (also inside dicts and lists) by their values"""
+    if isinstance(value, Artifact):
+        return value.value
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item) for item in value]
+    return value
+
+
+class Pipeline:
+    """Runs training stages, recomputing only those whose inputs changed"""
+
+    def __init__(self, cache_dir=CACHE_DIR, verbose=True):
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+        self.hits = 0
+        self.misses = 0
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def source(self, path):
+        """Artifact for an input file, keyed on its content (the value is the path)"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return Artifact(digest.hexdigest(), value=path)
+
+    def key(self, name, func, **inputs):
+        """Cache key of stage `name` computed by `func` from artifacts and parameters"""
+        payload = json.dumps([name, code_digest(func), describe(inputs)], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _paths(self, name, key):
+        base = os.path.join(self.cache_dir, name, key)
+        return base + '.pkl', base + '.json'
+
+    def lookup(self, name, key):
+        """Cached artifact of stage `name` for `key`, or None"""
+        value_path, digest_path = self._paths(name, key)
+        if not (os.path.exists(value_path) and os.path.exists(digest_path)):
+            return None
+        with open(digest_path) as f:
+            return Artifact(json.load(f)['digest'], value_path)
+
+    def store(self, name, key, value):
+        """Cache `value` as the output of stage `name` for `key`"""
+        value_path, digest_path = self._paths(name, key)
+        os.makedirs(os.path.dirname(value_path), exist_ok=True)
+        buffer = io.BytesIO()
+        joblib.dump(value, buffer)
+        data = buffer.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        with open(value_path, 'wb') as f:
+            f.write(data)
+        with open(digest_path, 'w') as f:
+            json.dump({'digest': digest}, f)
+        return Artifact(digest, value_path, value)
+
+    def run(self, name, func, **inputs):
+        """Return stage `name`'s cached artifact, or compute func(**inputs) and cache it"""
+        key = self.key(name, func, **inputs)
+        artifact = self.lookup(name, key)
+        if artifact is not None:
+            self.hits += 1
+            self._log(f"⏭️  {name}: cached")
+            return artifact
+        self.misses += 1
+        started = time.perf_counter()
+        value = func(**{input_name: resolve(item) for input_name, item in inputs.items()})
+        artifact = self.store(name, key, value)
+        self._log(f"⚙️  {name}: computed in {time.perf_counter() - started:.3f} s")
+        return artifact
+
+    def export(self, name, func, outputs, **inputs):
+        """
+        Run func(**inputs) to write `outputs` unless the last export of
+        `name` had the same key and the output files are unchanged since
+
+        Returns True when the export ran.
+        """
+        key = self.key(name, func, **inputs)
+        marker_path = os.path.join(self.cache_dir, f"{name}.json")
+        if os.path.exists(marker_path):
+            with open(marker_path) as f:
+                marker = json.load(f)
+            if marker['key'] == key and marker['outputs'] == _file_stamps(outputs):
+                self.hits += 1
+                self._log(f"⏭️  {name}: outputs up to date")
+                return False
+        self.misses += 1
+        started = time.perf_counter()
+        func(**{input_name: resolve(item) for input_name, item in inputs.items()})
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(marker_path, 'w') as f:
+            json.dump({'key': key, 'outputs': _file_stamps(outputs)}, f)
+        self._log(f"⚙️  {name}: exported in {time.perf_counter() - started:.3f} s")
+        return True
+
+
+def _file_stamps(paths):
+    """(size, mtime) of each output file or directory entry, None when missing"""
+    stamps = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.listdir(path)):
+                entry_path = os.path.join(path, entry)
+                stat = os.stat(entry_path)
+                stamps[entry_path] = [stat.st_size, stat.st_mtime_ns]
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            stamps[path] = [stat.st_size, stat.st_mtime_ns]
+        else:
+            stamps[path] = None
+    return stamps
+
+
+# Shared stages of the training scripts
+
+def load_dataset(source, feature_columns, target_column):
+    """Load stage: feature matrix and target from the dataset CSV (typed, see dataset.py)"""
+    from dataset import load_employment_data
+    df = load_employment_data(source, columns=[*feature_columns, target_column])
+    return df[feature_columns], df[target_column]
+
+
+def split_dataset(data, test_size=0.2, random_state=42):
+    """Split stage: (X_train, X_test, y_train, y_test)"""
+    from sklearn.model_selection import train_test_split
+    X, y = data
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def scale_split(split):
+    """Scale stage: (scaler fitted on the training rows, X_train_scaled, X_test_scaled)"""
+    from sklearn.preprocessing import StandardScaler
+    X_train, X_test, _, _ = split
+    scaler = StandardScaler()
+    return scaler, scaler.fit_transform(X_train), scaler.transform(X_test)
+
+
+def prepare_data(pipeline, data_path=DATA_PATH, feature_columns=FEATURE_COLUMNS,
+                 target_column=TARGET_COLUMN, test_size=0.2, random_state=42):
+    """Run the load, split and scale stages and return their (data, split, scaled) artifacts"""
+    data = pipeline.run('load', load_dataset, source=pipeline.source(data_path),
+                        feature_columns=feature_columns, target_column=target_column)
+    split = pipeline.run('split', split_dataset, data=data, test_size=test_size,
+                         random_state=random_state)
+    scaled = pipeline.run('scale', scale_split, split=split)
+    return data, split, scaled
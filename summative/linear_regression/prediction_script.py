@@ -1,11 +1,24 @@
+from functools import lru_cache
+
 import joblib
 import numpy as np
 
-def load_model():
-    """Load the best trained model"""
-    model_data = joblib.load('best_model.pkl')
+@lru_cache(maxsize=None)
+def load_model(path='best_model.pkl'):
+    """Load the best trained model (once per process)"""
+    model_data = joblib.load(path)
     return model_data
 
+FEATURE_NAMES = [
+    'gdp_per_capita',
+    'life_expectancy',
+    'population',
+    'urban_population_percent',
+    'school_enrollment_primary',
+    'school_enrollment_secondary',
+    'literacy_rate'
+]
+
 def predict_employment_rate(features):
     """
     Predict employment rate using the best model
@@ -23,33 +36,31 @@ def predict_employment_rate(features):
     Returns:
     float: Predicted employment rate percentage
     """
-    # Load model
+    return predict_employment_rates([features])[0]
+
+def predict_employment_rates(rows):
+    """
+    Predict employment rates for many feature dictionaries in one model call
+    
+    Parameters:
+    rows (list of dict): Dictionaries with the same keys as predict_employment_rate
+    
+    Returns:
+    numpy.ndarray: Predicted employment rate percentage for each row
+    """
+    # Load model (cached after the first call)
     model_data = load_model()
     model = model_data['model']
     scaler = model_data['scaler']
-    feature_columns = model_data['feature_columns']
     
-    # Prepare features
-    feature_values = [
-        features['gdp_per_capita'],
-        features['life_expectancy'],
-        features['population'],
-        features['urban_population_percent'],
-        features['school_enrollment_primary'],
-        features['school_enrollment_secondary'],
-        features['literacy_rate']
-    ]
-    
-    # Convert to numpy array and reshape
-    X = np.array(feature_values).reshape(1, -1)
+    # Prepare features in training column order
+    X = np.array([[features[name] for name in FEATURE_NAMES] for features in rows], dtype=float)
     
     # Scale features
     X_scaled = scaler.transform(X)
     
     # Make prediction
-    prediction = model.predict(X_scaled)[0]
-    
-    return prediction
+    return model.predict(X_scaled)
 
 def main():
     """Example usage of the prediction function"""
@@ -1,109 +1,490 @@
-import pandas as pd
+import argparse
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import joblib
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-def train_and_compare_models():
-    """Train all models and save the best performing one"""
+from pipeline import FEATURE_COLUMNS, LazyDict, Pipeline, prepare_data
+
+# The bundle format and tree flattening are defined once, by the API's reader
+API_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'API'))
+sys.path.append(API_DIR)
+
+from flat_forest import flat_forest_arrays  # noqa: E402
+from model_bundle import BUNDLE_FORMAT, BUNDLE_FORMAT_VERSION, MANIFEST_FILE, file_sha256  # noqa: E402
+
+# sklearn, matplotlib and the estimators are imported by the stages that use
+# them: importing them costs more than a whole run where every stage is cached
+
+# Import name -> distribution name, where they differ
+DISTRIBUTIONS = {'sklearn': 'scikit-learn'}
+
+class EstimatorSpec:
+    """
+    An estimator named by its import path and parameters, built on demand
+
+    Specs key the fit stage without importing the estimator's package; the
+    package version is part of the key, so upgrading it refits the models.
+    """
+
+    def __init__(self, path, **params):
+        self.path = path
+        self.params = params
+        package = path.split('.')[0]
+        self.version = importlib.metadata.version(DISTRIBUTIONS.get(package, package))
+
+    def build(self):
+        """A new, unfitted estimator"""
+        module, _, name = self.path.rpartition('.')
+        return getattr(importlib.import_module(module), name)(**self.params)
+
+    def get_params(self, deep=False):
+        return {'estimator': self.path, 'version': self.version, **self.params}
+
+    def __repr__(self):
+        params = ', '.join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"{self.path.rpartition('.')[2]}({params})"
+
+def make_estimator(estimator):
+    """Unfitted estimator for a candidate: a spec is built, an estimator is cloned"""
+    if isinstance(estimator, EstimatorSpec):
+        return estimator.build()
+    from sklearn.base import clone
+    return clone(estimator)
+
+# Candidate models compared by train_and_compare_models, as (name, estimator)
+# pairs. Candidates are built (specs) or cloned (estimators) before fitting, so
+# a new model only needs an entry here (or in the `candidates` argument).
+CANDIDATE_MODELS = [
+    ('Linear Regression', EstimatorSpec('sklearn.linear_model.LinearRegression')),
+    ('Random Forest', EstimatorSpec('sklearn.ensemble.RandomForestRegressor',
+                                    n_estimators=100, random_state=42, n_jobs=-1)),
+    ('Decision Tree', EstimatorSpec('sklearn.tree.DecisionTreeRegressor', random_state=42))
+]
+
+# Serving bundles go where the API loads them from: MODEL_BUNDLE_DIR (relative
+# to the API directory, like the API's own setting) or API/bundles
+BUNDLE_DIR = os.path.join(API_DIR, os.environ.get('MODEL_BUNDLE_DIR', 'bundles'))
+EVALUATION_FILE = 'model_evaluation.npz'
+
+def fit_candidate(estimator, X_train, y_train):
+    """Fit stage: a fitted copy of one candidate (runs in a worker process)"""
+    return make_estimator(estimator).fit(X_train, y_train)
+
+def fit_candidates(candidates, X_train, y_train, workers=None):
+    """
+    Fit all candidates concurrently, one process each, and return the
+    fitted models in candidate order
+
+    Estimators with n_jobs=-1 (the forest) still use every core for their
+    own trees, so the slowest candidate bounds the wall-clock time.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(candidates))
+    if workers <= 1:
+        return {name: fit_candidate(estimator, X_train, y_train) for name, estimator in candidates}
+    
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {name: pool.submit(fit_candidate, estimator, X_train, y_train)
+                   for name, estimator in candidates}
+        return {name: future.result() for name, future in futures.items()}
+
+def evaluate_candidate(model, split, scaled):
+    """Evaluate stage: train and test metrics and predictions of a fitted model"""
+    from sklearn.metrics import mean_squared_error, r2_score
+    _, _, y_train, y_test = split
+    _, X_train_scaled, X_test_scaled = scaled
+    
+    # Make predictions
+    y_pred_train = model.predict(X_train_scaled)
+    y_pred_test = model.predict(X_test_scaled)
+    
+    return {
+        'train_r2': r2_score(y_train, y_pred_train),
+        'test_r2': r2_score(y_test, y_pred_test),
+        'train_rmse': np.sqrt(mean_squared_error(y_train, y_pred_train)),
+        'test_rmse': np.sqrt(mean_squared_error(y_test, y_pred_test)),
+        'y_pred_train': y_pred_train,
+        'y_pred_test': y_pred_test
+    }
+
+# Hyperparameter grids searched for each candidate when train_and_compare_models
+# is called with search='grid' | 'random' | 'halving'
+PARAM_GRIDS = {
+    'Linear Regression': {'fit_intercept': [True, False]},
+    'Random Forest': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_leaf': [1, 2, 5],
+        'max_features': [1.0, 'sqrt']
+    },
+    'Decision Tree': {
+        'max_depth': [None, 3, 5, 8, 12],
+        'min_samples_leaf': [1, 2, 5, 10, 20]
+    }
+}
+
+SEARCH_STRATEGIES = ('grid', 'random', 'halving')
+
+# Scaled fold matrices per (data fingerprint, n_folds, random_state), shared
+# by every parameter set and inherited by the search workers
+_fold_cache = {}
+_search_folds = None
+
+def data_fingerprint(X, y):
+    """SHA-256 of the feature matrix and target, used to key cached folds and scores"""
+    digest = hashlib.sha256()
+    for array in (np.ascontiguousarray(X, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64)):
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def scaled_folds(X, y, n_folds=5, random_state=42):
+    """
+    K-fold (train, validation) matrices, each scaled with a StandardScaler
+    fitted on that fold's training rows
     
-    # Load data
-    df = pd.read_csv('comprehensive_african_employment_data.csv')
+    Training rows are stored in a fixed random order so successive halving
+    can use the first n rows of a fold as its subsample. Results are cached
+    in memory for the lifetime of the process.
+    """
+    from sklearn.model_selection import KFold
+    from sklearn.preprocessing import StandardScaler
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    key = (data_fingerprint(X, y), n_folds, random_state)
+    if key not in _fold_cache:
+        rng = np.random.default_rng(random_state)
+        folds = []
+        for train_index, val_index in KFold(n_folds, shuffle=True, random_state=random_state).split(X):
+            train_index = rng.permutation(train_index)
+            scaler = StandardScaler()
+            folds.append((scaler.fit_transform(X[train_index]), y[train_index],
+                          scaler.transform(X[val_index]), y[val_index]))
+        _fold_cache[key] = folds
+    return key[0], _fold_cache[key]
+
+class ScoreCache:
+    """
+    Fold scores memoized on disk, one JSON line per (parameter set, fold)
     
-    # Select features
-    feature_columns = ['GDP_per_capita', 'Life_expectancy', 'Population', 
-                      'Urban_population_percent', 'School_enrollment_primary', 
-                      'School_enrollment_secondary', 'Literacy_rate']
+    Keys hash the estimator class, its full parameters, the data fingerprint,
+    the fold layout and the training subsample size, so changing any of
+    them scores again while repeated runs reuse earlier fits.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.scores = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.scores[entry['key']] = entry['score']
+
+    @staticmethod
+    def key(estimator, fingerprint, n_folds, random_state, fold, n_rows):
+        params = {name: repr(value) for name, value in estimator.get_params().items() if name != 'n_jobs'}
+        payload = json.dumps([type(estimator).__name__, params, fingerprint, n_folds,
+                              random_state, fold, n_rows], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def add(self, entries):
+        """Record {key: score} entries and append them to the cache file"""
+        self.scores.update(entries)
+        if self.path and entries:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                for key, score in entries.items():
+                    f.write(json.dumps({'key': key, 'score': score}) + '\n')
+
+def _init_search_worker(folds):
+    global _search_folds
+    _search_folds = folds
+
+def score_fold(estimator, fold, n_rows):
+    """Fit on the first n_rows training rows of one cached fold and score on its validation rows"""
+    from sklearn.base import clone
+    from sklearn.metrics import mean_squared_error, r2_score
+    X_train, y_train, X_val, y_val = _search_folds[fold]
+    model = clone(estimator).fit(X_train[:n_rows], y_train[:n_rows])
+    y_pred = model.predict(X_val)
+    return {'r2': r2_score(y_val, y_pred), 'rmse': float(np.sqrt(mean_squared_error(y_val, y_pred)))}
+
+def score_parameter_sets(estimator, param_sets, folds, fingerprint, n_folds, random_state,
+                         cache, workers=None, n_rows=None):
+    """
+    Mean cross-validated R² and RMSE for every parameter set
     
-    X = df[feature_columns]
-    y = df['Employment_rate']
+    Only (parameter set, fold) pairs missing from the cache are fitted;
+    they run concurrently, one task per fold, in a process pool.
+    """
+    global _search_folds
+    from sklearn.base import clone
+    n_rows = n_rows or min(len(fold[1]) for fold in folds)
+    workers = workers or os.cpu_count() or 1
+    
+    tasks = {}
+    keys = []
+    for params in param_sets:
+        model = clone(estimator).set_params(**params)
+        # Parallelism comes from the folds; keep each fit on one core
+        if workers > 1 and 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+        param_keys = []
+        for fold in range(len(folds)):
+            key = cache.key(model, fingerprint, n_folds, random_state, fold, n_rows)
+            param_keys.append(key)
+            if key not in cache.scores and key not in tasks:
+                tasks[key] = (model, fold)
+        keys.append(param_keys)
+    
+    if tasks:
+        if workers <= 1 or len(tasks) == 1:
+            _search_folds = folds
+            scores = {key: score_fold(model, fold, n_rows) for key, (model, fold) in tasks.items()}
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context,
+                                     initializer=_init_search_worker, initargs=(folds,)) as pool:
+                futures = {key: pool.submit(score_fold, model, fold, n_rows)
+                           for key, (model, fold) in tasks.items()}
+                scores = {key: future.result() for key, future in futures.items()}
+        cache.add(scores)
+    
+    results = []
+    for params, param_keys in zip(param_sets, keys):
+        fold_scores = [cache.scores[key] for key in param_keys]
+        results.append({
+            'params': params,
+            'n_rows': n_rows,
+            'cv_r2': float(np.mean([score['r2'] for score in fold_scores])),
+            'cv_r2_std': float(np.std([score['r2'] for score in fold_scores])),
+            'cv_rmse': float(np.mean([score['rmse'] for score in fold_scores]))
+        })
+    return results, len(tasks)
+
+def search_hyperparameters(estimator, param_grid, X, y, strategy='grid', n_folds=5, n_iter=20,
+                           factor=3, min_rows=50, random_state=42, workers=None,
+                           cache_path='hyperparameter_cache/scores.jsonl'):
+    """
+    K-fold cross-validated hyperparameter search
     
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    strategy: 'grid' (every combination), 'random' (n_iter sampled
+    combinations) or 'halving' (successive halving over the grid: every
+    combination is scored on min_rows training rows per fold, the best
+    1/factor survive and are scored again on factor times more rows).
     
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Train models
-    models = {
-        'Linear Regression': LinearRegression(),
-        'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
-        'Decision Tree': DecisionTreeRegressor(random_state=42)
+    Returns a dict with best_params, best_score (mean CV R²), the scored
+    results of every round and how many fold fits were actually run.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy '{strategy}' (expected one of {SEARCH_STRATEGIES})")
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+    estimator = make_estimator(estimator)
+    fingerprint, folds = scaled_folds(X, y, n_folds, random_state)
+    cache = ScoreCache(cache_path)
+    full_rows = min(len(fold[1]) for fold in folds)
+    
+    if strategy == 'random':
+        param_sets = list(ParameterSampler(param_grid, n_iter, random_state=random_state))
+    else:
+        param_sets = list(ParameterGrid(param_grid))
+    
+    def score(param_sets, n_rows):
+        return score_parameter_sets(estimator, param_sets, folds, fingerprint, n_folds,
+                                    random_state, cache, workers, n_rows)
+    
+    history = []
+    fits = 0
+    if strategy == 'halving':
+        # Start small enough that about `factor` sets are left for the full-size round
+        rounds = math.ceil(math.log(len(param_sets), factor)) if len(param_sets) > 1 else 0
+        n_rows = max(min_rows, full_rows // factor ** max(rounds - 1, 0))
+        while len(param_sets) > 1 and n_rows < full_rows:
+            results, new_fits = score(param_sets, n_rows)
+            history.extend(results)
+            fits += new_fits
+            results.sort(key=lambda result: result['cv_r2'], reverse=True)
+            param_sets = [result['params'] for result in results[:math.ceil(len(results) / factor)]]
+            n_rows = min(full_rows, n_rows * factor)
+    
+    results, new_fits = score(param_sets, full_rows)
+    history.extend(results)
+    fits += new_fits
+    best = max(results, key=lambda result: result['cv_r2'])
+    return {
+        'best_params': best['params'],
+        'best_score': best['cv_r2'],
+        'best_rmse': best['cv_rmse'],
+        'results': history,
+        'fits': fits
     }
-    
-    results = {}
-    
-    print("🚀 Training and comparing models...")
-    
-    for name, model in models.items():
-        print(f"\n📊 Training {name}...")
-        
-        # Train model
-        model.fit(X_train_scaled, y_train)
-        
-        # Make predictions
-        y_pred_train = model.predict(X_train_scaled)
-        y_pred_test = model.predict(X_test_scaled)
-        
-        # Calculate metrics
-        train_r2 = r2_score(y_train, y_pred_train)
-        test_r2 = r2_score(y_test, y_pred_test)
-        train_rmse = np.sqrt(mean_squared_error(y_train, y_pred_train))
-        test_rmse = np.sqrt(mean_squared_error(y_test, y_pred_test))
-        
-        results[name] = {
-            'model': model,
-            'train_r2': train_r2,
-            'test_r2': test_r2,
-            'train_rmse': train_rmse,
-            'test_rmse': test_rmse,
-            'y_pred_train': y_pred_train,
-            'y_pred_test': y_pred_test
-        }
-        
-        print(f"   Training R²: {train_r2:.4f}")
-        print(f"   Test R²: {test_r2:.4f}")
-        print(f"   Test RMSE: {test_rmse:.4f}")
-    
-    # Find best model (highest test R²)
-    best_model_name = max(results.keys(), key=lambda x: results[x]['test_r2'])
-    best_model = results[best_model_name]['model']
+
+def train_and_compare_models(candidates=None, workers=None, search=None, n_folds=5, n_iter=20,
+                             param_grids=None, cache_path='hyperparameter_cache/scores.jsonl',
+                             pipeline=None, bundle_float32=False, bundle_compress=False):
+    """
+    Train all models and save the best performing one
+    
+    candidates: (name, estimator or EstimatorSpec) pairs to compare, CANDIDATE_MODELS by default
+    workers: processes used to fit candidates concurrently (default: CPU count)
+    search: None, or 'grid' / 'random' / 'halving' to tune every candidate
+        that has a grid in param_grids (PARAM_GRIDS by default) with n_folds
+        cross-validation on the training split. The winner is then the
+        candidate with the best mean CV R² instead of the best test R².
+    pipeline: Pipeline caching the load, split, scale, fit, evaluate and
+        export stages (default: Pipeline() in ./pipeline_cache), so a rerun
+        only recomputes what changed since the last one
+    bundle_float32, bundle_compress: store the serving bundles in float32
+        and/or as one compressed .npz (see export_model_bundle)
+    """
+    candidates = list(candidates or CANDIDATE_MODELS)
+    names = [name for name, _ in candidates]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Candidate model names must be unique, got {names}")
+    
+    pipeline = pipeline or Pipeline()
+    _, split, scaled = prepare_data(pipeline)
+    
+    searches = {}
+    if search:
+        param_grids = PARAM_GRIDS if param_grids is None else param_grids
+        tuned = []
+        for name, estimator in candidates:
+            if name in param_grids:
+                print(f"🔎 Tuning {name} ({search} search, {n_folds}-fold CV)...")
+                X_train, _, y_train, _ = split.value
+                searches[name] = search_hyperparameters(
+                    estimator, param_grids[name], X_train, y_train, strategy=search,
+                    n_folds=n_folds, n_iter=n_iter, workers=workers, cache_path=cache_path
+                )
+                print(f"   Best params: {searches[name]['best_params']}")
+                print(f"   CV R²: {searches[name]['best_score']:.4f} ({searches[name]['fits']} new fold fits)")
+                estimator = make_estimator(estimator).set_params(**searches[name]['best_params'])
+            tuned.append((name, estimator))
+        candidates = tuned
+    
+    # Fit only the candidates whose estimator or training data changed
+    fit_keys = {name: pipeline.key('fit', fit_candidate, estimator=estimator, split=split, scaled=scaled)
+                for name, estimator in candidates}
+    fitted = {name: pipeline.lookup('fit', key) for name, key in fit_keys.items()}
+    missing = [(name, estimator) for name, estimator in candidates if fitted[name] is None]
+    if missing:
+        print(f"🚀 Training {len(missing)} of {len(candidates)} models in parallel...")
+        _, X_train_scaled, _ = scaled.value
+        y_train = split.value[2]
+        for name, model in fit_candidates(missing, X_train_scaled, y_train, workers).items():
+            fitted[name] = pipeline.store('fit', fit_keys[name], model)
+    else:
+        print(f"⏭️  fit: all {len(candidates)} models cached")
+    pipeline.hits += len(candidates) - len(missing)
+    pipeline.misses += len(missing)
+    
+    evaluations = {name: pipeline.run('evaluate', evaluate_candidate, model=fitted[name], split=split, scaled=scaled)
+                   for name in fitted}
+    cv_scores = {name: {'cv_r2': search_result['best_score'], 'cv_rmse': search_result['best_rmse'],
+                        'best_params': search_result['best_params']}
+                 for name, search_result in searches.items()}
+    results = {name: {**evaluation.value, **cv_scores.get(name, {})} for name, evaluation in evaluations.items()}
+    
+    for name, result in results.items():
+        print(f"\n📊 {name}")
+        print(f"   Training R²: {result['train_r2']:.4f}")
+        print(f"   Test R²: {result['test_r2']:.4f}")
+        print(f"   Test RMSE: {result['test_rmse']:.4f}")
+        if 'cv_r2' in result:
+            print(f"   CV R²: {result['cv_r2']:.4f}")
+    
+    # Find best model (highest mean CV R² when tuned, otherwise highest test R²)
+    score_key = 'cv_r2' if searches else 'test_r2'
+    best_model_name = max(results.keys(), key=lambda x: results[x].get(score_key, -np.inf))
     
     print(f"\n🏆 Best Model: {best_model_name}")
     print(f"   Test R²: {results[best_model_name]['test_r2']:.4f}")
     print(f"   Test RMSE: {results[best_model_name]['test_rmse']:.4f}")
     
-    # Save best model
+    outputs = ['best_model.pkl', 'all_models.pkl', 'model_comparison.png', EVALUATION_FILE,
+               *[os.path.join(BUNDLE_DIR, bundle_slug(name)) for name in results]]
+    pipeline.export('export_models', export_models, outputs, models=fitted, evaluations=evaluations,
+                    cv_scores=cv_scores, split=split, scaled=scaled, best_model_name=best_model_name,
+                    bundle_float32=bundle_float32, bundle_compress=bundle_compress)
+    
+    # The model and scaler are only unpickled if the caller reads them
+    model_data = LazyDict(build_model_data(fitted[best_model_name], scaled.derive(lambda scaled: scaled[0]),
+                                           best_model_name, results[best_model_name]))
+    print(f"⏱️  {pipeline.misses} stage(s) computed, {pipeline.hits} cached")
+    return best_model_name, model_data
+
+def build_model_data(model, scaler, model_name, result):
+    """best_model.pkl payload for a fitted model and its result entry"""
     model_data = {
-        'model': best_model,
+        'model': model,
         'scaler': scaler,
-        'feature_columns': feature_columns,
-        'model_name': best_model_name,
+        'feature_columns': FEATURE_COLUMNS,
+        'model_name': model_name,
         'metrics': {
-            'train_r2': results[best_model_name]['train_r2'],
-            'test_r2': results[best_model_name]['test_r2'],
-            'train_rmse': results[best_model_name]['train_rmse'],
-            'test_rmse': results[best_model_name]['test_rmse']
+            'train_r2': result['train_r2'],
+            'test_r2': result['test_r2'],
+            'train_rmse': result['train_rmse'],
+            'test_rmse': result['test_rmse']
         }
     }
+    if 'cv_r2' in result:
+        model_data['metrics']['cv_r2'] = result['cv_r2']
+        model_data['metrics']['cv_rmse'] = result['cv_rmse']
+        model_data['params'] = result['best_params']
+    return model_data
+
+def export_models(models, evaluations, cv_scores, split, scaled, best_model_name,
+                  bundle_float32=False, bundle_compress=False):
+    """
+    Export stage: best_model.pkl, one serving bundle per model, the
+    evaluation artifacts, all_models.pkl and the comparison plots
+    """
+    scaler, X_train_scaled, X_test_scaled = scaled
+    _, _, y_train, y_test = split
+    results = {name: {'model': model, **evaluations[name], **cv_scores.get(name, {})}
+               for name, model in models.items()}
     
+    # Save best model
+    model_data = build_model_data(models[best_model_name], scaler, best_model_name, results[best_model_name])
     joblib.dump(model_data, 'best_model.pkl')
     print(f"✅ Best model saved as 'best_model.pkl'")
     
-    # Save all models for comparison
+    # Pickle-free bundles for the API (replaces the pickled forest and flat forest directory)
+    manifests = {}
+    for name, model in models.items():
+        metrics = {key: float(value) for key, value in results[name].items()
+                   if key in ('train_r2', 'test_r2', 'train_rmse', 'test_rmse', 'cv_r2', 'cv_rmse')}
+        bundle_path = os.path.join(BUNDLE_DIR, bundle_slug(name))
+        if export_model_bundle(model, scaler, bundle_path, name,
+                               metrics=metrics, float32=bundle_float32, compress=bundle_compress):
+            manifests[name] = os.path.join(bundle_path, MANIFEST_FILE)
+    
+    # Per-row predictions go to their own evaluation files, not into the model pickles
+    export_evaluation(results, y_train, y_test)
+    
+    # Save all models for comparison: metrics and where each model's bundle is
+    # (the fitted models and scaler live in the bundles, not in this pickle)
     all_models_data = {
-        'models': results,
-        'scaler': scaler,
-        'feature_columns': feature_columns,
-        'best_model_name': best_model_name
+        'models': {name: {**{key: value for key, value in result.items()
+                             if key != 'model' and not key.startswith('y_pred')},
+                          'bundle_manifest': manifests.get(name)}
+                   for name, result in results.items()},
+        'feature_columns': FEATURE_COLUMNS,
+        'best_model_name': best_model_name,
+        'evaluation_file': EVALUATION_FILE
     }
     
     joblib.dump(all_models_data, 'all_models.pkl')
@@ -111,14 +492,125 @@ def train_and_compare_models():
     
     # Create comparison plots
     create_comparison_plots(results, X_train_scaled, y_train, X_test_scaled, y_test)
-    
-    return best_model_name, model_data
+
+def bundle_slug(name):
+    """Bundle directory name of a model: 'Random Forest' -> 'random_forest'"""
+    return name.lower().replace(' ', '_')
+
+def float32_thresholds(threshold):
+    """
+    Round split thresholds down to float32 without changing any decision
+
+    Inputs are compared as float32, and for a float32 x, x > t exactly when
+    x > (largest float32 <= t), so the rounded thresholds route every input
+    the same way as the float64 ones.
+    """
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+def model_payload(model, float32=False):
+    """(model_type, arrays) of a bundle, or None for models a bundle cannot describe"""
+    if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+        arrays = flat_forest_arrays(model)
+        # The API rebuilds both sides from the interleaved pairs
+        del arrays['children_left'], arrays['children_right']
+        if float32:
+            arrays['threshold'] = float32_thresholds(arrays['threshold'])
+            arrays['value'] = arrays['value'].astype(np.float32)
+            arrays['feature_importances'] = arrays['feature_importances'].astype(np.float32)
+        return 'tree_ensemble', arrays
+    
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        coef, intercept = model.coef_, model.intercept_
+    elif getattr(model, 'weights', None) is not None:
+        coef, intercept = model.weights, model.bias
+    else:
+        return None
+    coef = np.asarray(coef, dtype=np.float32 if float32 else np.float64)
+    if coef.ndim != 1 or np.ndim(intercept) != 0:
+        return None
+    return 'linear', {'coef': coef, 'intercept': np.array(float(intercept))}
+
+def export_model_bundle(model, scaler, path, model_name, metrics=None, float32=False, compress=False):
+    """
+    Write a versioned, pickle-free model bundle
+    
+    `path` gets a manifest.json (format version, model name and type,
+    feature order, scaler mean/scale, metrics, payload dtypes and shapes,
+    SHA-256 of each payload file) and the payload arrays, either one
+    uncompressed .npy per array (memory-mappable) or, with compress=True,
+    a single compressed arrays.npz. float32=True halves the node values and
+    coefficients (thresholds are rounded so tree routing is unchanged).
+    Returns False for models a bundle cannot describe.
+    """
+    payload = model_payload(model, float32)
+    if payload is None:
+        print(f"⚠️  {model_name}: no bundle format for {type(model).__name__}, only pickled")
+        return False
+    model_type, arrays = payload
+    
+    os.makedirs(path, exist_ok=True)
+    for entry in os.listdir(path):
+        os.remove(os.path.join(path, entry))
+    if compress:
+        np.savez_compressed(os.path.join(path, 'arrays.npz'), **arrays)
+        files = ['arrays.npz']
+    else:
+        files = []
+        for key, array in arrays.items():
+            np.save(os.path.join(path, f"{key}.npy"), array)
+            files.append(f"{key}.npy")
+    
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'model_name': model_name,
+        'model_type': model_type,
+        'feature_columns': FEATURE_COLUMNS,
+        'scaler': None if scaler is None else {
+            'mean': np.asarray(scaler.mean_, dtype=np.float64).tolist(),
+            'scale': np.asarray(scaler.scale_, dtype=np.float64).tolist()
+        },
+        'metrics': metrics or {},
+        'float32': float32,
+        'compressed': compress,
+        'arrays': {key: {'dtype': str(array.dtype), 'shape': list(array.shape)} for key, array in arrays.items()},
+        'files': {name: file_sha256(os.path.join(path, name)) for name in files}
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in files)
+    print(f"✅ {model_name} bundle ({model_type}, {size / 1024:.0f} KB) exported to '{path}'")
+    return True
+
+def export_evaluation(results, y_train, y_test, path=EVALUATION_FILE):
+    """
+    Write per-row evaluation predictions to `path` (.npz, one array per
+    model and split plus the targets) and all metrics to a .json beside it
+    """
+    arrays = {'y_train': np.asarray(y_train, dtype=np.float64), 'y_test': np.asarray(y_test, dtype=np.float64)}
+    metrics = {}
+    for name, result in results.items():
+        slug = bundle_slug(name)
+        arrays[f"{slug}__y_pred_train"] = np.asarray(result['y_pred_train'])
+        arrays[f"{slug}__y_pred_test"] = np.asarray(result['y_pred_test'])
+        metrics[name] = {key: value if key == 'best_params' else float(value)
+                         for key, value in result.items()
+                         if key not in ('model', 'y_pred_train', 'y_pred_test')}
+    np.savez_compressed(path, **arrays)
+    with open(os.path.splitext(path)[0] + '.json', 'w') as f:
+        json.dump(metrics, f, indent=2)
+    print(f"✅ Evaluation predictions saved as '{path}'")
 
 def create_comparison_plots(results, X_train, y_train, X_test, y_test):
     """Create comprehensive comparison plots"""
+    import matplotlib.pyplot as plt
     
     # Model performance comparison
-    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    n_columns = max(3, len(results))
+    fig, axes = plt.subplots(2, n_columns, figsize=(6 * n_columns, 12))
     fig.suptitle('Model Performance Comparison', fontsize=16, fontweight='bold')
     
     # R² Score comparison
@@ -171,14 +663,27 @@ def create_comparison_plots(results, X_train, y_train, X_test, y_test):
 def create_prediction_script():
     """Create a prediction script for the best model"""
     
-    script_content = '''import joblib
+    script_content = '''from functools import lru_cache
+
+import joblib
 import numpy as np
 
-def load_model():
-    """Load the best trained model"""
-    model_data = joblib.load('best_model.pkl')
+@lru_cache(maxsize=None)
+def load_model(path='best_model.pkl'):
+    """Load the best trained model (once per process)"""
+    model_data = joblib.load(path)
     return model_data
 
+FEATURE_NAMES = [
+    'gdp_per_capita',
+    'life_expectancy',
+    'population',
+    'urban_population_percent',
+    'school_enrollment_primary',
+    'school_enrollment_secondary',
+    'literacy_rate'
+]
+
 def predict_employment_rate(features):
     """
     Predict employment rate using the best model
@@ -196,33 +701,31 @@ def predict_employment_rate(features):
     Returns:
     float: Predicted employment rate percentage
     """
-    # Load model
+    return predict_employment_rates([features])[0]
+
+def predict_employment_rates(rows):
+    """
+    Predict employment rates for many feature dictionaries in one model call
+    
+    Parameters:
+    rows (list of dict): Dictionaries with the same keys as predict_employment_rate
+    
+    Returns:
+    numpy.ndarray: Predicted employment rate percentage for each row
+    """
+    # Load model (cached after the first call)
     model_data = load_model()
     model = model_data['model']
     scaler = model_data['scaler']
-    feature_columns = model_data['feature_columns']
-    
-    # Prepare features
-    feature_values = [
-        features['gdp_per_capita'],
-        features['life_expectancy'],
-        features['population'],
-        features['urban_population_percent'],
-        features['school_enrollment_primary'],
-        features['school_enrollment_secondary'],
-        features['literacy_rate']
-    ]
-    
-    # Convert to numpy array and reshape
-    X = np.array(feature_values).reshape(1, -1)
+    
+    # Prepare features in training column order
+    X = np.array([[features[name] for name in FEATURE_NAMES] for features in rows], dtype=float)
     
     # Scale features
     X_scaled = scaler.transform(X)
     
     # Make prediction
-    prediction = model.predict(X_scaled)[0]
-    
-    return prediction
+    return model.predict(X_scaled)
 
 def main():
     """Example usage of the prediction function"""
@@ -258,8 +761,21 @@ if __name__ == "__main__":
     print("✅ Prediction script created as 'prediction_script.py'")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train, compare and save the employment rate models")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--search', choices=SEARCH_STRATEGIES, default=None,
+                        help="Tune each candidate with a cross-validated hyperparameter search")
+    parser.add_argument('--folds', type=int, default=5, help="Cross-validation folds (default: 5)")
+    parser.add_argument('--n-iter', type=int, default=20, help="Parameter sets sampled by --search random (default: 20)")
+    parser.add_argument('--float32', action='store_true', help="Store serving bundles in float32")
+    parser.add_argument('--compress', action='store_true', help="Store serving bundles as one compressed .npz")
+    args = parser.parse_args()
+    
     # Train and save best model
-    best_model_name, model_data = train_and_compare_models()
+    best_model_name, model_data = train_and_compare_models(
+        workers=args.workers, search=args.search, n_folds=args.folds, n_iter=args.n_iter,
+        bundle_float32=args.float32, bundle_compress=args.compress
+    )
     
     # Create prediction script
     create_prediction_script()
@@ -268,6 +784,8 @@ if __name__ == "__main__":
     print(f"🏆 Best model: {best_model_name}")
     print(f"📁 Files created:")
     print(f"   - best_model.pkl (best performing model)")
-    print(f"   - all_models.pkl (all models for comparison)")
+    print(f"   - all_models.pkl (metrics of all models and their bundle manifests)")
+    print(f"   - {BUNDLE_DIR}/ (pickle-free model bundles for the API)")
+    print(f"   - model_evaluation.npz / .json (evaluation predictions and metrics)")
     print(f"   - prediction_script.py (prediction script)")
     print(f"   - model_comparison.png (comparison plots)") 
\ No newline at end of file
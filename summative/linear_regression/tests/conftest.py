@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+TRAINING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TRAINING_DIR)
+
+DATA_PATH = os.path.join(TRAINING_DIR, 'comprehensive_african_employment_data.csv')
+
+
+@pytest.fixture(scope='session')
+def employment_frame():
+    """The first 400 rows of the employment panel"""
+    import pandas as pd
+    return pd.read_csv(DATA_PATH, nrows=400)
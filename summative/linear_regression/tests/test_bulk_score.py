@@ -0,0 +1,78 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from bulk_score import FEATURE_COLUMNS, bulk_score
+
+
+@pytest.fixture
+def model_path(tmp_path, employment_frame):
+    X = employment_frame[FEATURE_COLUMNS]
+    scaler = StandardScaler().fit(X)
+    model = LinearRegression().fit(scaler.transform(X), employment_frame['Employment_rate'])
+    path = tmp_path / 'model.pkl'
+    joblib.dump({'model': model, 'scaler': scaler, 'feature_columns': FEATURE_COLUMNS}, path)
+    return str(path)
+
+
+@pytest.fixture
+def expected(employment_frame, model_path):
+    model_data = joblib.load(model_path)
+    return model_data['model'].predict(model_data['scaler'].transform(employment_frame[FEATURE_COLUMNS]))
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_chunked_csv_scoring_matches_direct_predictions(tmp_path, employment_frame, model_path, expected, workers):
+    input_path, output_path = tmp_path / 'panel.csv', tmp_path / 'scored.csv'
+    frame = employment_frame.copy()
+    frame.loc[5, 'Literacy_rate'] = np.nan
+    frame.to_csv(input_path, index=False)
+
+    rows, _ = bulk_score(str(input_path), str(output_path), model_path, workers=workers,
+                         chunk_bytes=4096, keep_columns=['country', 'Year'])
+
+    scored = pd.read_csv(output_path)
+    assert rows == len(frame) and list(scored.columns) == ['Country', 'Year', 'predicted_employment_rate']
+    np.testing.assert_array_equal(scored['Year'], frame['Year'])
+    assert np.isnan(scored['predicted_employment_rate'][5])
+    np.testing.assert_allclose(scored['predicted_employment_rate'].drop(5), np.delete(expected, 5), rtol=1e-12)
+
+
+def test_parquet_row_groups(tmp_path, employment_frame, model_path, expected):
+    pytest.importorskip('pyarrow')
+    input_path, output_path = tmp_path / 'panel.parquet', tmp_path / 'scored.parquet'
+    employment_frame.to_parquet(input_path, row_group_size=64)
+
+    rows, _ = bulk_score(str(input_path), str(output_path), model_path, workers=2)
+
+    assert rows == len(employment_frame)
+    np.testing.assert_allclose(pd.read_parquet(output_path)['predicted_employment_rate'], expected, rtol=1e-12)
+
+
+def test_unknown_keep_column(tmp_path, employment_frame, model_path):
+    input_path = tmp_path / 'panel.csv'
+    employment_frame.to_csv(input_path, index=False)
+
+    with pytest.raises(KeyError):
+        bulk_score(str(input_path), str(tmp_path / 'scored.csv'), model_path, keep_columns=['Region'])
+
+
+def test_csv_pieces_keep_quoted_newlines_in_one_row(tmp_path, employment_frame, model_path, expected):
+    from bulk_score import split_csv
+
+    input_path, output_path = tmp_path / 'panel.csv', tmp_path / 'scored.csv'
+    frame = employment_frame.copy()
+    frame['Country'] = frame['Country'] + '\n"Republic", ' + frame.index.astype(str)
+    frame.to_csv(input_path, index=False)
+
+    _, ranges = split_csv(str(input_path), 1000)
+    rows, _ = bulk_score(str(input_path), str(output_path), model_path, workers=3,
+                         chunk_bytes=1000, keep_columns=['Country'])
+
+    scored = pd.read_csv(output_path)
+    assert len(ranges) > 10 and rows == len(frame)
+    assert list(scored['Country']) == list(frame['Country'])
+    np.testing.assert_allclose(scored['predicted_employment_rate'], expected, rtol=1e-12)
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import SCHEMA, cache_dir_for, load_employment_data
+
+
+def is_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+@pytest.fixture
+def panel_csv(tmp_path, employment_frame):
+    path = tmp_path / 'panel.csv'
+    employment_frame.to_csv(path, index=False)
+    return str(path)
+
+
+def test_cached_load_matches_the_parsed_csv(panel_csv, employment_frame):
+    parsed = load_employment_data(panel_csv)
+    cached = load_employment_data(panel_csv)
+
+    assert os.path.exists(os.path.join(cache_dir_for(panel_csv), 'meta.json'))
+    assert dict(cached.dtypes.astype(str)) == SCHEMA
+    pd.testing.assert_frame_equal(cached.copy(), parsed)
+    assert is_mapped(cached['GDP_per_capita'].to_numpy())
+    np.testing.assert_array_equal(cached['Population'], employment_frame['Population'])
+    assert list(cached['Country']) == list(employment_frame['Country'])
+
+
+def test_cache_is_rebuilt_when_the_csv_changes(panel_csv, employment_frame):
+    load_employment_data(panel_csv, columns=['Year', 'Literacy_rate'])
+    employment_frame.head(10).to_csv(panel_csv, index=False)
+    stat = os.stat(panel_csv)
+    os.utime(panel_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert len(load_employment_data(panel_csv, columns=['Year', 'Literacy_rate'])) == 10
+
+
+def test_invalid_rows_and_columns_are_rejected(panel_csv, employment_frame):
+    frame = employment_frame.copy()
+    frame.loc[0, 'Urban_population_percent'] = 130.0
+    frame.to_csv(panel_csv, index=False)
+
+    with pytest.raises(ValueError, match='Urban_population_percent'):
+        load_employment_data(panel_csv, use_cache=False)
+    with pytest.raises(KeyError):
+        load_employment_data(panel_csv, columns=['Region'])
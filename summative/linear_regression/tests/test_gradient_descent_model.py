@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from gradient_descent_model import GradientDescentLinearRegression
+
+
+@pytest.fixture(scope='module')
+def regression_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 5))
+    y = X @ np.array([2.0, -1.0, 0.5, 0.0, 3.0]) + 4.0 + rng.normal(scale=0.3, size=600)
+    return X[:500], y[:500], X[500:], y[500:]
+
+
+def fitted(regression_data, **params):
+    model = GradientDescentLinearRegression(**params)
+    model.fit(*regression_data)
+    return model
+
+
+def test_fast_mode_takes_the_same_steps(regression_data):
+    slow = fitted(regression_data, learning_rate=0.05, max_iterations=400)
+    fast = fitted(regression_data, learning_rate=0.05, max_iterations=400, fast=True, eval_interval=25)
+
+    np.testing.assert_allclose(fast.weights, slow.weights, rtol=1e-10)
+    assert fast.bias == pytest.approx(slow.bias, rel=1e-10)
+    np.testing.assert_allclose(fast.train_losses, slow.train_losses, rtol=1e-10)
+    np.testing.assert_allclose(fast.test_losses, np.asarray(slow.test_losses)[fast.test_loss_iterations], rtol=1e-10)
+    assert fast.test_loss_iterations[-1] == len(fast.train_losses) - 1
+
+
+@pytest.mark.parametrize('optimizer', ['gd', 'momentum', 'adam'])
+def test_minibatch_optimizers_converge(regression_data, optimizer):
+    X_train, y_train, _, _ = regression_data
+    exact = np.linalg.lstsq(np.column_stack([X_train, np.ones(len(X_train))]), y_train, rcond=None)[0]
+
+    model = fitted(regression_data, learning_rate=0.01, max_iterations=200, batch_size=32,
+                   optimizer=optimizer, random_state=0, tolerance=0)
+
+    np.testing.assert_allclose(model.weights, exact[:-1], atol=0.05)
+    assert model.n_updates == 200 * 16
+
+
+def test_partial_fit_calls_continue_one_shuffling_sequence(regression_data):
+    X_train, y_train, _, _ = regression_data
+    chunks = [(X_train[:250], y_train[:250]), (X_train[250:], y_train[250:])]
+
+    one_call = GradientDescentLinearRegression(batch_size=20, random_state=0).partial_fit(iter(chunks))
+    two_calls = GradientDescentLinearRegression(batch_size=20, random_state=0)
+    for X_chunk, y_chunk in chunks:
+        two_calls.partial_fit(X_chunk, y_chunk)
+
+    np.testing.assert_array_equal(two_calls.weights, one_call.weights)
+    assert len(two_calls.train_losses) == 2
+
+
+def test_partial_fit_streams_csv_chunks(tmp_path, employment_frame):
+    from gradient_descent_model import fit_scaler_on_chunks, iter_csv_chunks
+    from pipeline import FEATURE_COLUMNS, TARGET_COLUMN
+
+    path = tmp_path / 'panel.csv'
+    frame = employment_frame.copy()
+    frame.loc[3, 'GDP_per_capita'] = np.nan
+    frame.to_csv(path, index=False)
+    scaler = fit_scaler_on_chunks(str(path), FEATURE_COLUMNS, TARGET_COLUMN, chunksize=100)
+
+    model = GradientDescentLinearRegression(learning_rate=0.05, batch_size=32, random_state=0)
+    for _ in range(20):
+        model.partial_fit(iter_csv_chunks(str(path), FEATURE_COLUMNS, TARGET_COLUMN, chunksize=100, scaler=scaler))
+
+    assert sum(len(y) for _, y in iter_csv_chunks(str(path), FEATURE_COLUMNS, TARGET_COLUMN, chunksize=100)) == 399
+    assert len(model.train_losses) == 80 and model.train_losses[-1] < model.train_losses[0]
+
+
+@pytest.mark.parametrize('solver', ['normal', 'qr', 'lstsq', 'conjugate_gradient', 'auto'])
+def test_direct_solvers_match_lstsq(regression_data, solver):
+    X_train, y_train, _, _ = regression_data
+    exact = np.linalg.lstsq(np.column_stack([X_train, np.ones(len(X_train))]), y_train, rcond=None)[0]
+
+    model = fitted(regression_data, solver=solver, tolerance=1e-12)
+
+    np.testing.assert_allclose(model.weights, exact[:-1], rtol=1e-8)
+    assert model.bias == pytest.approx(exact[-1], rel=1e-8)
+    assert len(model.train_losses) == 1
+    assert model.solver_ == ('normal' if solver == 'auto' else solver)
+
+
+@pytest.mark.parametrize('solver', ['normal', 'qr'])
+def test_rank_deficient_data_falls_back_to_lstsq(regression_data, solver):
+    X_train, y_train, X_test, y_test = regression_data
+    # The last column duplicates the first, so X.T @ X is singular
+    X_train, X_test = np.column_stack([X_train, X_train[:, 0]]), np.column_stack([X_test, X_test[:, 0]])
+
+    model = GradientDescentLinearRegression(solver=solver)
+    model.fit(X_train, y_train, X_test, y_test)
+    reference = GradientDescentLinearRegression(solver='lstsq')
+    reference.fit(X_train, y_train, X_test, y_test)
+
+    assert np.all(np.isfinite(model.weights))
+    np.testing.assert_allclose(model.predict(X_test), reference.predict(X_test), rtol=1e-8)
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        GradientDescentLinearRegression(solver='newton')
@@ -0,0 +1,79 @@
+import os
+
+from pipeline import _MISSING, Artifact, LazyDict, Pipeline, describe
+
+
+def double(values):
+    return [value * 2 for value in values]
+
+
+def total(values):
+    return sum(values)
+
+
+def write_total(value, path):
+    with open(path, 'w') as f:
+        f.write(str(value))
+
+
+def test_stages_are_cached_and_invalidated_by_their_inputs(tmp_path):
+    source = tmp_path / 'data.txt'
+    source.write_text('1 2 3')
+
+    def run(pipeline, factor=1):
+        values = [int(v) * factor for v in open(pipeline.source(str(source)).value).read().split()]
+        doubled = pipeline.run('double', double, values=values)
+        return pipeline.run('total', total, values=doubled)
+
+    first = Pipeline(str(tmp_path / 'cache'), verbose=False)
+    assert run(first).value == 12 and (first.hits, first.misses) == (0, 2)
+
+    again = Pipeline(str(tmp_path / 'cache'), verbose=False)
+    cached = run(again)
+    assert (again.hits, again.misses) == (2, 0)
+    # Cached values are read on first use only
+    assert cached._value is _MISSING and cached.value == 12
+
+    changed = Pipeline(str(tmp_path / 'cache'), verbose=False)
+    assert run(changed, factor=2).value == 24 and changed.misses == 2
+
+
+def test_recomputed_stage_with_same_content_keeps_downstream_cached(tmp_path):
+    pipeline = Pipeline(str(tmp_path), verbose=False)
+    upstream = pipeline.run('double', double, values=[1, 2])
+    pipeline.run('total', total, values=upstream)
+
+    # Another input producing the same output has the same digest
+    same = pipeline.run('double', lambda values: [2, 4], values=[1, 2])
+    pipeline.run('total', total, values=same)
+
+    assert same.digest == upstream.digest
+    assert (pipeline.hits, pipeline.misses) == (1, 3)
+
+
+def test_export_reruns_only_when_key_or_outputs_change(tmp_path):
+    pipeline = Pipeline(str(tmp_path / 'cache'), verbose=False)
+    output = str(tmp_path / 'total.txt')
+
+    assert pipeline.export('write', write_total, [output], value=3, path=output)
+    assert not pipeline.export('write', write_total, [output], value=3, path=output)
+    os.remove(output)
+    assert pipeline.export('write', write_total, [output], value=3, path=output)
+    assert pipeline.export('write', write_total, [output], value=4, path=output)
+
+
+def test_lazy_dict_loads_artifacts_when_read():
+    loads = []
+    artifact = Artifact('digest', loader=lambda: loads.append(1) or (10, 20))
+    data = LazyDict({'name': 'model', 'first': artifact.derive(lambda value: value[0])})
+
+    assert list(data) == ['name', 'first'] and loads == []
+    assert data['first'] == 10 and data['first'] == 10
+    assert loads == [1]
+
+
+def test_worker_counts_do_not_change_keys():
+    from sklearn.ensemble import RandomForestRegressor
+
+    assert describe(RandomForestRegressor(n_jobs=1)) == describe(RandomForestRegressor(n_jobs=-1))
+    assert describe(RandomForestRegressor(max_depth=3)) != describe(RandomForestRegressor())
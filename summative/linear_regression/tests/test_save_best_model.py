@@ -0,0 +1,212 @@
+import numpy as np
+import pytest
+
+from save_best_model import EstimatorSpec, fit_candidates, make_estimator
+
+CANDIDATES = [
+    ('Linear Regression', EstimatorSpec('sklearn.linear_model.LinearRegression')),
+    ('Random Forest', EstimatorSpec('sklearn.ensemble.RandomForestRegressor', n_estimators=10, random_state=0)),
+    ('Decision Tree', EstimatorSpec('sklearn.tree.DecisionTreeRegressor', max_depth=6, random_state=0))
+]
+
+
+@pytest.fixture(scope='module')
+def training_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    return X, X[:, 0] * 2 + np.abs(X[:, 1]) + rng.normal(scale=0.1, size=300)
+
+
+def test_parallel_fit_matches_serial_fit(training_data):
+    X, y = training_data
+
+    serial = fit_candidates(CANDIDATES, X, y, workers=1)
+    parallel = fit_candidates(CANDIDATES, X, y, workers=3)
+
+    assert list(parallel) == [name for name, _ in CANDIDATES]
+    for name in serial:
+        np.testing.assert_array_equal(parallel[name].predict(X), serial[name].predict(X))
+
+
+def test_candidates_are_built_fresh(training_data):
+    from sklearn.linear_model import Ridge
+
+    spec = EstimatorSpec('sklearn.tree.DecisionTreeRegressor', max_depth=3)
+    ridge = Ridge(alpha=2.0).fit(*training_data)
+
+    assert make_estimator(spec).get_params()['max_depth'] == 3
+    clone = make_estimator(ridge)
+    assert clone is not ridge and clone.alpha == 2.0 and not hasattr(clone, 'coef_')
+
+
+def test_search_reuses_cached_fold_scores(tmp_path, training_data):
+    from save_best_model import search_hyperparameters
+
+    X, y = training_data
+    spec = EstimatorSpec('sklearn.tree.DecisionTreeRegressor', random_state=0)
+    grid = {'max_depth': [2, 4, 8], 'min_samples_leaf': [1, 5]}
+    cache_path = str(tmp_path / 'scores.jsonl')
+
+    first = search_hyperparameters(spec, grid, X, y, n_folds=3, workers=2, cache_path=cache_path)
+    again = search_hyperparameters(spec, grid, X, y, n_folds=3, workers=2, cache_path=cache_path)
+
+    assert (first['fits'], again['fits']) == (6 * 3, 0)
+    assert again['best_params'] == first['best_params'] and again['best_score'] == first['best_score']
+    assert first['best_score'] == max(result['cv_r2'] for result in first['results'])
+
+
+def test_halving_scores_survivors_on_more_rows(tmp_path, training_data):
+    from save_best_model import search_hyperparameters
+
+    X, y = training_data
+    spec = EstimatorSpec('sklearn.tree.DecisionTreeRegressor', random_state=0)
+    grid = {'max_depth': [1, 2, 3, 4, 6, 8, 10, 12, 16]}
+
+    result = search_hyperparameters(spec, grid, X, y, strategy='halving', n_folds=3, factor=3, min_rows=20,
+                                    workers=1, cache_path=str(tmp_path / 'scores.jsonl'))
+
+    rows = [entry['n_rows'] for entry in result['results']]
+    assert rows == sorted(rows) and rows[0] < rows[-1] == 200
+    assert len([n for n in rows if n == rows[-1]]) <= 3
+
+
+def test_unknown_search_strategy(training_data):
+    from save_best_model import search_hyperparameters
+
+    with pytest.raises(ValueError):
+        search_hyperparameters(CANDIDATES[0][1], {}, *training_data, strategy='bayes', cache_path=None)
+
+
+@pytest.fixture(scope='module')
+def fitted_models(training_data):
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = training_data
+    scaler = StandardScaler().fit(X)
+    return fit_candidates(CANDIDATES, scaler.transform(X), y, workers=1), scaler
+
+
+@pytest.mark.parametrize('float32', [False, True])
+@pytest.mark.parametrize('compress', [False, True])
+def test_bundles_round_trip(tmp_path, training_data, fitted_models, float32, compress):
+    from model_bundle import load_bundle
+    from save_best_model import export_model_bundle
+
+    X, _ = training_data
+    models, scaler = fitted_models
+    for name, model in models.items():
+        path = str(tmp_path / name)
+        assert export_model_bundle(model, scaler, path, name, metrics={'test_r2': 0.5},
+                                   float32=float32, compress=compress)
+
+        served, bundle_scaler, manifest = load_bundle(path, mmap_mode='r')
+
+        expected = model.predict(scaler.transform(X))
+        if float32:
+            # Routing is unchanged, only the stored values are rounded
+            np.testing.assert_allclose(served.predict(bundle_scaler.transform(X)), expected, rtol=1e-5, atol=1e-6)
+        else:
+            np.testing.assert_array_equal(served.predict(bundle_scaler.transform(X)), expected)
+        assert (manifest['model_name'], manifest['metrics']) == (name, {'test_r2': 0.5})
+        if manifest['model_type'] == 'tree_ensemble':
+            assert served.value.dtype == (np.float32 if float32 else np.float64)
+
+
+def test_tampered_or_newer_bundles_are_rejected(tmp_path, fitted_models):
+    import json
+
+    from model_bundle import BundleError, load_bundle
+    from save_best_model import export_model_bundle
+
+    models, scaler = fitted_models
+    path = tmp_path / 'forest'
+    export_model_bundle(models['Random Forest'], scaler, str(path), 'Random Forest')
+    value = np.load(path / 'value.npy')
+    value[0] += 1.0
+    np.save(path / 'value.npy', value)
+
+    with pytest.raises(BundleError, match='checksum mismatch for value.npy'):
+        load_bundle(str(path))
+
+    manifest = json.loads((path / 'manifest.json').read_text())
+    manifest['format_version'] += 1
+    (path / 'manifest.json').write_text(json.dumps(manifest))
+    with pytest.raises(BundleError, match='format version'):
+        load_bundle(str(path), verify=False)
+
+
+
+def test_bundles_trained_on_another_feature_order_are_rejected(tmp_path, fitted_models):
+    import json
+
+    from model_bundle import BundleError, load_bundle
+    from pipeline import FEATURE_COLUMNS
+    from save_best_model import export_model_bundle
+
+    models, scaler = fitted_models
+    path = tmp_path / 'linear'
+    export_model_bundle(models['Linear Regression'], scaler, str(path), 'Linear Regression')
+    api_features = [column.lower() for column in FEATURE_COLUMNS]
+
+    assert load_bundle(str(path), feature_names=api_features)[2]['feature_columns'] == FEATURE_COLUMNS
+
+    manifest = json.loads((path / 'manifest.json').read_text())
+    manifest['feature_columns'] = FEATURE_COLUMNS[1::-1] + FEATURE_COLUMNS[2:]
+    (path / 'manifest.json').write_text(json.dumps(manifest))
+    with pytest.raises(BundleError, match='trained on features'):
+        load_bundle(str(path), feature_names=api_features)
+
+def test_evaluation_predictions_are_kept_out_of_pickles(tmp_path):
+    import json
+
+    from save_best_model import export_evaluation
+
+    results = {'Decision Tree': {'model': object(), 'test_r2': 0.9, 'y_pred_train': np.arange(3.0),
+                                 'y_pred_test': np.arange(2.0)}}
+    path = str(tmp_path / 'evaluation.npz')
+
+    export_evaluation(results, np.zeros(3), np.ones(2), path=path)
+
+    with np.load(path) as arrays:
+        np.testing.assert_array_equal(arrays['decision_tree__y_pred_test'], [0.0, 1.0])
+        assert set(arrays) == {'y_train', 'y_test', 'decision_tree__y_pred_train', 'decision_tree__y_pred_test'}
+    assert json.loads((tmp_path / 'evaluation.json').read_text()) == {'Decision Tree': {'test_r2': 0.9}}
+
+
+def test_api_serves_the_exported_bundles(tmp_path):
+    import json
+    import os
+    import subprocess
+    import sys
+
+    from sklearn.preprocessing import StandardScaler
+
+    from save_best_model import API_DIR, BUNDLE_DIR, FEATURE_COLUMNS, bundle_slug, export_model_bundle
+
+    # Without MODEL_BUNDLE_DIR, training writes where the API reads
+    assert BUNDLE_DIR == os.path.join(API_DIR, 'bundles')
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(1.0, 100.0, size=(200, len(FEATURE_COLUMNS)))
+    y = X @ rng.normal(size=len(FEATURE_COLUMNS)) + rng.normal(size=200)
+    scaler = StandardScaler().fit(X)
+    models = fit_candidates(CANDIDATES, scaler.transform(X), y, workers=1)
+    for name, model in models.items():
+        export_model_bundle(model, scaler, str(tmp_path / bundle_slug(name)), name)
+    probe = (
+        "import json, sys, numpy as np, prediction\n"
+        "X = np.array(json.loads(sys.stdin.read()))\n"
+        "for name in sys.argv[1:]:\n"
+        "    served = prediction.registry.load(name)\n"
+        "    print(json.dumps([served.model_file, served.predict_sync(X).tolist()]))\n"
+    )
+    slugs = [bundle_slug(name) for name in models]
+    completed = subprocess.run(
+        [sys.executable, '-c', probe, *slugs], cwd=API_DIR, input=json.dumps(X[:50].tolist()),
+        env={**os.environ, 'MODEL_BUNDLE_DIR': str(tmp_path)}, capture_output=True, text=True, check=True
+    )
+
+    served = [json.loads(line) for line in completed.stdout.splitlines() if line.startswith('[')]
+    assert [model_file for model_file, _ in served] == [str(tmp_path / slug) for slug in slugs]
+    for model, (_, predictions) in zip(models.values(), served):
+        np.testing.assert_allclose(predictions, model.predict(scaler.transform(X[:50])), rtol=1e-12)